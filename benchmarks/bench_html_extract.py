@@ -0,0 +1,71 @@
+"""
+Compare the HTML extraction backends on a readthedocs project search page, and check they extract the same names.
+
+The page is generated with the structure of https://readthedocs.org/search/?type=project (the markup the /doc
+autocomplete selector expects), padded with the inline scripts, styles and menus of the real page.
+
+Usage: python benchmarks/bench_html_extract.py [number of results]
+"""
+import random
+import string
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from cogs.doc import PROJECTS_SELECTOR  # noqa: E402
+from utils.html_extract import BACKENDS, load_backend, select_texts  # noqa: E402
+
+
+def random_text(rng: random.Random, words: int) -> str:
+    return " ".join("".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9))) for _ in range(words))
+
+
+def search_page(results: int, rng: random.Random) -> str:
+    head = "".join(f"<script>var data{i} = '{random_text(rng, 200)}';</script>" for i in range(40))
+    head += "".join(f"<style>.c{i} {{ margin: {i}px; }}</style>" for i in range(200))
+    menu = "".join(f'<li><a href="/{i}">{random_text(rng, 3)}</a></li>' for i in range(300))
+    items = "".join(
+        '<li class="module-item">'
+        f'<p class="module-item-title"><a href="/projects/p{i}/">project-{i} ({random_text(rng, 1)})</a></p>'
+        f"<p>{random_text(rng, 30)}</p>"
+        "</li>"
+        for i in range(results)
+    )
+    content = (
+        '<div id="content"><div class="wrapper"><div><div><div class="module"><div class="module-wrapper">'
+        f'<div class="module-list"><div class="module-list-wrapper"><ul>{items}</ul></div></div>'
+        "</div></div></div></div></div></div>"
+    )
+    footer = f"<footer>{random_text(rng, 500)}</footer>"
+    return f"<html><head>{head}</head><body><nav><ul>{menu}</ul></nav>{content}{footer}</body></html>"
+
+
+def main() -> None:
+    results = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    page = search_page(results, random.Random(0))
+    print(f"Page of {len(page) / 1024:.0f} KiB, {results} results.")
+
+    _, reference_backend = load_backend("bs4")
+    reference = select_texts(page, PROJECTS_SELECTOR, backend=reference_backend)  # The previous implementation
+    assert len(reference) == results
+
+    for name in BACKENDS:
+        try:
+            _, backend = load_backend(name)
+        except ImportError:
+            print(f"{name:>10}: not installed")
+            continue
+
+        for start_marker in (None, 'id="content"'):
+            texts = select_texts(page, PROJECTS_SELECTOR, start_marker, backend=backend)
+            assert texts == reference, f"{name} extracted different texts"
+            elapsed = min(
+                timeit.repeat(lambda: select_texts(page, PROJECTS_SELECTOR, start_marker, backend=backend), number=5)
+            )
+            print(f"{name:>10} ({'subtree' if start_marker else 'full page'}): {elapsed / 5 * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Compare the cost of a /tag invocation (finding the tag and preparing its embeds) with the previous implementation,
+that built the embeds from the payloads on every call.
+
+Usage: python benchmarks/bench_tag_embeds.py
+"""
+import os
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+os.environ.setdefault("GITHUB_REPOSITORY_TOKEN", "")
+
+import discord  # noqa: E402
+
+from cogs.tag import Tag, TagEmbedPayload, parse_tag_payload  # noqa: E402
+
+RAW_TAG = """
+name = "intents"
+description = "Activer les intents privilégiés"
+content = "Les intents permettent de choisir les événements reçus."
+
+[[embeds]]
+title = "Intents"
+description = "Les intents privilégiés doivent être activés sur le portail développeur."
+image = "https://example.com/intents.png"
+
+[[embeds.fields]]
+name = "Portail"
+value = "https://discord.com/developers/applications"
+
+[[embeds.fields]]
+name = "Documentation"
+value = "https://discordpy.readthedocs.io/en/latest/intents.html"
+
+[[embeds]]
+title = "Exemple"
+description = "```py\\nintents = discord.Intents.default()\\nintents.members = True\\n```"
+"""
+
+
+def build_embeds(embeds_payloads: list[TagEmbedPayload]) -> list[discord.Embed]:
+    """The previous Tag.embeds property, and the mutations done by the command."""
+    embeds: list[discord.Embed] = []
+    for embed_payload in embeds_payloads:
+        embed = discord.Embed(title=embed_payload.title, description=embed_payload.description)
+        for field in embed_payload.fields:
+            embed.add_field(name=field.name, value=field.value, inline=field.inline)
+        if embed_payload.image:
+            embed.set_image(url=embed_payload.image)
+        if embed_payload.thumbnail:
+            embed.set_thumbnail(url=embed_payload.thumbnail)
+        embeds.append(embed)
+
+    if embeds:
+        embeds[-1].set_footer(text="Les tags sont fait par la communauté, n'hésitez pas à en proposer.")
+        for embed in embeds:
+            embed.color = discord.Color.from_rgb(47, 49, 54)
+    return embeds
+
+
+def main() -> None:
+    payload = parse_tag_payload(RAW_TAG)
+    tags = {"discord": [Tag(parse_tag_payload(RAW_TAG.replace("intents", f"tag{i}", 1)), "discord") for i in range(50)]}
+    tags["discord"].append(Tag(payload, "discord"))
+    tags_by_identifier = {f"{tag.category}.{tag.name}": tag for tag in tags["discord"]}
+
+    def before() -> list[discord.Embed]:
+        category_name, tag_name = "discord.intents".split(".")
+        tag = discord.utils.get(tags[category_name], name=tag_name)
+        assert tag is not None
+        return build_embeds(payload.embeds)
+
+    def after() -> tuple[discord.Embed, ...]:
+        return tags_by_identifier["discord.intents"].embeds
+
+    assert [embed.to_dict() for embed in before()] == [embed.to_dict() for embed in after()]
+
+    number = 20_000
+    for label, to_dict in (("embeds ready to send", False), ("including to_dict, done by discord.py", True)):
+        if to_dict:
+            before_time = timeit.timeit(lambda: [e.to_dict() for e in before()], number=number) / number
+            after_time = timeit.timeit(lambda: [e.to_dict() for e in after()], number=number) / number
+        else:
+            before_time = timeit.timeit(before, number=number) / number
+            after_time = timeit.timeit(after, number=number) / number
+        print(f"{label}:")
+        print(f"  before: {before_time * 1e6:.2f}µs per invocation")
+        print(f"  after:  {after_time * 1e6:.2f}µs per invocation ({before_time / after_time:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Compare the /tag autocomplete search of the tags index with the previous linear scan.
+
+Usage: python benchmarks/bench_tag_search.py [number of tags]
+"""
+import random
+import string
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils.search import SearchIndex  # noqa: E402
+
+
+class Tag:
+    def __init__(self, name: str, category: str, description: str) -> None:
+        self.name = name
+        self.category = category
+        self.description = description
+
+
+def random_word(rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10)))
+
+
+def linear_search(tags: dict[str, list[Tag]], search_text: str) -> list[Tag]:
+    """The search done by the autocomplete before the index."""
+    tags_begin_match: set[Tag] = set()
+    tags_contained_match: set[Tag] = set()
+    tags_category_match: set[Tag] = set()
+
+    for category, tags_list in tags.items():
+        for tag in tags_list:
+            if tag.name.startswith(search_text):
+                tags_begin_match.add(tag)
+            elif search_text in tag.name:
+                tags_contained_match.add(tag)
+
+        if category.startswith(search_text):
+            tags_category_match |= set(tags_list)
+
+    tags_category_match = tags_category_match - tags_begin_match - tags_contained_match
+
+    def sort_key(tag: Tag) -> tuple[str, str]:
+        return tag.category, tag.name
+
+    return (
+        sorted(tags_begin_match, key=sort_key)
+        + sorted(tags_contained_match, key=sort_key)
+        + sorted(tags_category_match, key=sort_key)
+    )[:25]
+
+
+def main(tags_number: int) -> None:
+    rng = random.Random(0)
+    categories = [random_word(rng) for _ in range(20)]
+    tags: dict[str, list[Tag]] = {}
+    for _ in range(tags_number):
+        category = rng.choice(categories)
+        tag = Tag("-".join(random_word(rng) for _ in range(2)), category, " ".join(random_word(rng) for _ in range(8)))
+        tags.setdefault(category, []).append(tag)
+
+    all_tags = sorted((tag for tags_list in tags.values() for tag in tags_list), key=lambda t: (t.category, t.name))
+    build_time = timeit.timeit(
+        lambda: SearchIndex(all_tags, lambda t: t.name, lambda t: t.category, lambda t: t.description), number=1
+    )
+    index = SearchIndex(all_tags, lambda t: t.name, lambda t: t.category, lambda t: t.description)
+    print(f"{tags_number} tags, index built in {build_time * 1000:.1f}ms")
+
+    queries = ["", "a", "ab", all_tags[0].name[:4], all_tags[-1].name[2:6], "xqzv", all_tags[1].name[::-1][:6]]
+    print(f"{'query':<10} {'linear (µs)':>12} {'index (µs)':>12}")
+    for query in queries:
+        number = 200
+        linear = timeit.timeit(lambda: linear_search(tags, query), number=number) / number
+        indexed = timeit.timeit(lambda: index.search(query), number=number) / number
+        print(f"{query!r:<10} {linear * 1e6:>12.1f} {indexed * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,46 @@
+"""
+Compare the token scanner with the previous per-part regex search, on messages without tokens.
+
+Usage: python benchmarks/bench_token_scanner.py [number of messages]
+"""
+import random
+import re
+import string
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils.token_scanner import scan  # noqa: E402
+
+OLD_PATTERN = re.compile(r"[\w\-=]{24}\.[\w\-=]{6}\.[\w\-=]{27}", re.ASCII)
+
+
+def random_message(rng: random.Random) -> list[str]:
+    words = ["".join(rng.choices(string.ascii_letters, k=rng.randint(2, 10))) for _ in range(rng.randint(3, 60))]
+    content = " ".join(words) + rng.choice(("", ".", ". Ok."))
+    # The previous version stringified every embed part, even the missing ones.
+    return [content] + ["None"] * rng.choice((0, 0, 0, 7))
+
+
+def old_scan(parts: list[str]) -> bool:
+    return any(OLD_PATTERN.search(part) for part in parts)
+
+
+def new_scan(parts: list[str]) -> bool:
+    return any(True for _ in scan("\n".join(parts)))
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    rng = random.Random(0)
+    messages = [random_message(rng) for _ in range(count)]
+
+    for name, function in (("per-part regex", old_scan), ("scanner", new_scan)):
+        elapsed = min(timeit.repeat(lambda: [function(m) for m in messages], number=1, repeat=5))
+        print(f"{name:>15}: {elapsed / count * 1e6:.2f} µs/message")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,3 @@
 #!/bin/bash
 docker stop help-center && docker rm help-center
-docker run --name help-center -d --restart="always" help-center
+docker run --name help-center -d --restart="always" -v help-center-data:/app/data help-center
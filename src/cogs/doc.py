@@ -1,86 +1,316 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import asyncio
+import os
+from typing import TYPE_CHECKING, NamedTuple
 from urllib import parse
 
 import discord
-from aiohttp import ClientSession
-from bs4 import BeautifulSoup
 from discord import app_commands
 from discord.ext import commands
 
+from utils import html_extract
+from utils.cache import SingleFlight, TTLCache
+from utils.coalescer import Coalescer
 from utils.constants import BUG_CENTER_ID
+from utils.custom_errors import CustomError
+from utils.project_index import ProjectIndex
+from utils.search import normalize
 
 if TYPE_CHECKING:
     from main import HelpCenterBot
 
 
+DOC_DEFAULT_VERSIONS = ("latest", "stable")
+DOC_MAX_SEARCHES = 6  # Searches per /doc, for every project and version
+DOC_SEARCH_DEADLINE = 10  # Seconds, the searches that are slower are shown next time
+DOC_MAX_HITS = 8
+DOC_RANK_CONSTANT = 60  # Hits are scored by reciprocal rank, comparable between projects and versions
+DOC_RESULTS_CACHE_SIZE = int(tmp) if (tmp := os.getenv("DOC_RESULTS_CACHE_SIZE")) and tmp.isdigit() else 512
+DOC_RESULTS_TTL = 60 * 60  # Seconds a /doc result is reused
+DOC_EMPTY_RESULTS_TTL = 5 * 60
+
+PROJECTS_PATH = os.getenv("DOC_PROJECTS_PATH", "data/doc_projects.json")
+PROJECTS_SEARCH_TTL = 6 * 60 * 60  # Seconds before a query is searched on readthedocs again
+PROJECTS_SEARCH_ERROR_TTL = 60
+# Discord drops autocomplete answers after 3 seconds, the local results are sent if readthedocs is slower.
+PROJECTS_SEARCH_TIMEOUT = 2
+
+
+PROJECTS_SELECTOR = (
+    "#content > div > div > div > div.module > div > div.module-list > div > ul > li > p.module-item-title > a"
+)
+
+
+def parse_projects(texts: list[str]) -> list[str]:
+    return [value for text in texts if (value := text.split(" (")[0].strip())]
+
+
+class DocHit(NamedTuple):
+    score: float
+    title: str
+    url: str
+    domain: str
+    project: str
+    version: str
+
+
+class DocResult(NamedTuple):
+    count: int  # The total number of results, only the first page of hits is kept
+    hits: tuple[DocHit, ...]
+
+
+def result_key(project: str, version: str, query: str) -> tuple[str, str, str]:
+    """Only the cache key is normalized, readthedocs gets the query as it was typed (case and accents matter)."""
+    return project, version, normalize(query)
+
+
+def split_list(text: str) -> list[str]:
+    return list(dict.fromkeys(item for raw_item in text.split(",") if (item := raw_item.strip())))
+
+
+def render_results(
+    query: str, doc: str, results: list[DocResult], pending: int, missing: int = 0
+) -> tuple[str, discord.Embed | None]:
+    """Merge the results of several searches, the hits with the best scores first."""
+    hits = sorted((hit for result in results for hit in result.hits), key=lambda hit: -hit.score)
+    if not hits:
+        if pending:
+            return f"Searching **{query}** in **{doc}**...", None
+        return "Nothing found." if not missing else "The documentation could not be searched, try again later.", None
+
+    best = hits[0]
+    embed = discord.Embed(
+        title=f"{sum(result.count for result in results)} Results (click here for a complete search)",
+        url=f"{best.domain}/en/{best.version}/search.html?q={parse.quote_plus(query)}",
+    )
+    several_sources = len({(hit.project, hit.version) for hit in hits}) > 1
+    embed.description = "".join(
+        f"\n[{hit.title}]({hit.url})" + (f" ({hit.project} {hit.version})" if several_sources else "")
+        for hit in hits[:DOC_MAX_HITS]
+    )
+
+    footer = "Documentations provided by https://readthedocs.org"
+    if pending:
+        footer += f" - {pending} searches pending"
+    elif missing:
+        footer += f" - {missing} searches did not answer"
+    embed.set_footer(text=footer)
+    return f"Results for query **{query}** and documentation **{doc}**", embed
+
+
 class Doc(commands.Cog):
     def __init__(self, bot: HelpCenterBot) -> None:
         self.bot: HelpCenterBot = bot
         self.bot.tree.add_command(self.doc, guild=discord.Object(id=BUG_CENTER_ID))
 
+        # Autocomplete answers come from the projects known locally, readthedocs is only searched for new queries.
+        self.projects = ProjectIndex(PROJECTS_PATH, self.bot.logger)
+        self.projects.add(["discord.py"])
+        self.searched_queries: TTLCache[str, bool] = TTLCache(max_size=4096, ttl=PROJECTS_SEARCH_TTL)
+        self.projects_searches: SingleFlight[str, None] = SingleFlight()
+        self.projects_saver = Coalescer(self.save_projects, 60, self.bot.logger)
+
+        # Search results, by (project, version, normalized query).
+        self.results: TTLCache[tuple[str, str, str], DocResult] = TTLCache(DOC_RESULTS_CACHE_SIZE, DOC_RESULTS_TTL)
+        self.doc_searches: SingleFlight[tuple[str, str, str], DocResult] = SingleFlight()
+
+    async def cog_unload(self) -> None:
+        await self.projects_saver.wait()
+
+    async def save_projects(self) -> None:
+        try:
+            await asyncio.to_thread(self.projects.save)
+        except OSError as e:
+            self.bot.logger.warning(f"The documentation projects cannot be saved. Error : {e}")
+
+    def add_projects(self, names: list[str]) -> None:
+        if self.projects.add(names):
+            self.projects_saver.trigger()
+
     @app_commands.command(
         name="doc",
-        description="Shows 4 or fewer links referring to a documentation on readthedocs.io :D",
+        description="Shows links referring to documentations on readthedocs.io :D",
+    )
+    @app_commands.describe(
+        doc="The documentations you want to search for, separated by commas.",
+        query="The search query.",
+        version=f"The versions to search, separated by commas (default: {', '.join(DOC_DEFAULT_VERSIONS)}).",
     )
-    @app_commands.describe(doc="The documentation you want to search for.", query="The search query.")
     # @checkers.authorized_channels()
-    async def doc(self, inter: discord.Interaction, doc: str, query: str) -> None:
+    async def doc(self, inter: discord.Interaction, doc: str, query: str, version: str | None = None) -> None:
+        query = query.strip()
+        projects = split_list(doc)
+        versions = split_list(version) if version else list(DOC_DEFAULT_VERSIONS)
+        sources = [(project, v) for project in projects for v in versions]
+        if not sources:
+            raise CustomError("Aucune documentation donnée.")
+        if len(sources) > DOC_MAX_SEARCHES:
+            raise CustomError(
+                f"Trop de recherches ({len(projects)} documentations × {len(versions)} versions), "
+                f"{DOC_MAX_SEARCHES} au maximum."
+            )
+
+        # Looked up once, so the cache statistics count each search once and an entry can't expire in between.
+        results: list[DocResult] = []
+        missing: list[tuple[str, str]] = []
+        for source in sources:
+            if (result := self.results.get(result_key(*source, query))) is None:
+                missing.append(source)
+            else:
+                results.append(result)
+        if not missing:
+            content, embed = render_results(query, doc, results, pending=0)
+            return await inter.response.send_message(content=content, embed=embed)
+
+        # Readthedocs can be slow, the interaction would expire after 3 seconds.
+        await inter.response.defer()
+        if any(result.hits for result in results):
+            content, embed = render_results(query, doc, results, pending=len(missing))
+            await inter.edit_original_response(content=content, embed=embed)
+
+        searches = {asyncio.ensure_future(self.get_result(*source, query)) for source in missing}
+        failed = 0
+        deadline = asyncio.get_running_loop().time() + DOC_SEARCH_DEADLINE
+
+        # The results are shown as soon as a search answers, and completed as the others answer.
+        while searches and (timeout := deadline - asyncio.get_running_loop().time()) > 0:
+            done, searches = await asyncio.wait(searches, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for search in done:
+                if search.exception() is None:
+                    results.append(search.result())
+                else:
+                    failed += 1
+                    self.bot.logger.warning(f"A /doc search failed. Error : {search.exception()}")
+            if done:
+                content, embed = render_results(query, doc, results, pending=len(searches))
+                await inter.edit_original_response(content=content, embed=embed)
+
+        # The slow searches are shielded, they go on in the background and are cached for the next time.
+        for search in searches:
+            search.cancel()
+        if searches or failed:
+            content, embed = render_results(query, doc, results, pending=0, missing=len(searches) + failed)
+            await inter.edit_original_response(content=content, embed=embed)
+
+    async def get_result(self, project: str, version: str, query: str) -> DocResult:
+        """Search readthedocs, and cache the result. Concurrent identical searches share the same request."""
+
+        key = result_key(project, version, query)
+
+        async def search() -> DocResult:
+            result = await self.search_doc(project, version, query)
+            self.results.set(key, result, ttl=None if result.hits else DOC_EMPTY_RESULTS_TTL)
+            return result
+
+        return await self.doc_searches.run(key, search)
+
+    async def search_doc(self, project: str, version: str, query: str) -> DocResult:
         url = "https://readthedocs.org/api/v2/search/"
         params = {
             "q": query,
-            "project": doc,
-            "version": "master",
+            "project": project,
+            "version": version,
         }
-        async with ClientSession() as session:
-            async with session.get(url, params=params) as r:
-                json = await r.json()
-                print(json)
+        response = await self.bot.http_service.fetch("GET", url, params=params, endpoint="readthedocs search")
+        if response.status == 404:  # The project or the version doesn't exist
+            return DocResult(0, ())
+        response.raise_for_status()
+        json = response.json()
 
         if not json.get("count"):
-            return await inter.response.send_message("Nothing found.")
+            return DocResult(0, ())
+        self.add_projects([project])
+
+        hits: list[DocHit] = []
+        for result in json["results"]:
+            page_url = f"{result['domain']}{result['path']}?highlight={parse.quote_plus(query)}"
+            for block in result.get("blocks") or [{"title": result["title"], "id": ""}]:
+                score = 1 / (DOC_RANK_CONSTANT + len(hits))
+                block_url = f"{page_url}#{block['id']}" if block.get("id") else page_url
+                hits.append(DocHit(score, block["title"], block_url, result["domain"], project, version))
+        return DocResult(json["count"], tuple(hits))
 
-        embed = discord.Embed(
-            title=f"{json['count']} Results (click here for a complete search)",
-            url=f"{json['results'][0]['domain']}/en/stable/search.html?q={query}",
+    @app_commands.command()
+    @app_commands.guilds(BUG_CENTER_ID)
+    @app_commands.default_permissions(manage_messages=True)
+    async def doc_cache_stats(self, inter: discord.Interaction) -> None:
+        """Show the statistics of the /doc results cache."""
+        requests = self.results.hits + self.results.misses
+        await inter.response.send_message(
+            content=(
+                f"{len(self.results)}/{self.results.max_size} results cached.\n"
+                f"{self.results.hits} hits, {self.results.misses} misses "
+                f"({self.results.hits / requests if requests else 0:.0%} hit rate)."
+            ),
+            ephemeral=True,
         )
 
-        description = ""
+    @app_commands.command()
+    @app_commands.guilds(BUG_CENTER_ID)
+    @app_commands.default_permissions(manage_messages=True)
+    @app_commands.describe(
+        queries='Searches separated by ";", as "<documentation> <query>" (e.g. "discord.py Client").'
+    )
+    async def doc_cache_warm(self, inter: discord.Interaction, queries: str) -> None:
+        """Search common /doc queries in advance, so their results are cached."""
+        searches = [
+            (doc, version, query.strip())
+            for raw_query in queries.split(";")
+            if len(parts := raw_query.split(maxsplit=1)) == 2
+            for doc, query in (parts,)
+            for version in DOC_DEFAULT_VERSIONS
+        ]
+        if not searches:
+            raise CustomError('Aucune recherche valide, le format est "<documentation> <recherche>; ...".')
 
-        for result in json["results"][:4]:
-            try:
-                for block in result["blocks"][:2]:
-                    description += (
-                        f"\n[{block['title']}]({result['domain']}{result['path']}?highlight={query}#{block['id']})"
-                    )
-            except KeyError:
-                pass
+        await inter.response.defer(ephemeral=True)
+        results = await asyncio.gather(*(self.get_result(*search) for search in searches), return_exceptions=True)
+        failures = sum(isinstance(result, Exception) for result in results)
+        await inter.followup.send(
+            content=f"{len(searches) - failures}/{len(searches)} searches cached.", ephemeral=True
+        )
 
-        embed.description = description
+    async def search_projects(self, query: str) -> None:
+        """Search the projects matching the query on readthedocs, and add them to the local index."""
+        try:
+            response = await self.bot.http_service.fetch(
+                "GET",
+                "https://readthedocs.org/search/?type=project&version=latest&q=" + parse.quote_plus(query),
+                endpoint="readthedocs projects",
+            )
+            response.raise_for_status()
+            names = parse_projects(
+                await html_extract.select_texts_async(response.text(), PROJECTS_SELECTOR, start_marker='id="content"')
+            )
+        except Exception as e:
+            self.bot.logger.warning(f"Cannot search the documentation projects matching {query!r}. Error : {e}")
+            self.searched_queries.set(query, False, ttl=PROJECTS_SEARCH_ERROR_TTL)
+            return
 
-        embed.set_footer(text="Documentations provided by https://readthedocs.org")
-        await inter.response.send_message("Results for query **{query}** and documentation **{doc}**", embed=embed)
+        self.searched_queries.set(query, True)
+        self.add_projects(names)
 
     @doc.autocomplete("doc")
     async def doc_autocomplete(self, interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
-        if len(current) < 4:
-            return [app_commands.Choice(name="discord.py", value="discord.py")]
-
-        async with ClientSession() as session:
-            async with session.get(
-                "https://readthedocs.org/search/?type=project&version=latest&q=" + parse.quote_plus(current)
-            ) as r:
-                result = await r.text()
-        soup = BeautifulSoup(result, "html.parser")
+        # Only the last of the comma separated projects is completed.
+        previous, _, current = current.rpartition(",")
+        prefix = f"{previous}, " if previous else ""
+        query = normalize(current.strip())
+        if len(query) >= 4 and query not in self.searched_queries:
+            # Concurrent identical queries share the search, which goes on in the background after the timeout.
+            try:
+                await asyncio.wait_for(
+                    self.projects_searches.run(query, lambda: self.search_projects(query)), PROJECTS_SEARCH_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                pass
 
         return [
             app_commands.Choice(name=value, value=value)
-            for tag in soup.select(
-                "#content > div > div > div > div.module > div > div.module-list > div > ul > li > p.module-item-title > a"
-            )
-            if (value := tag.get_text().split(" (")[0].strip()) or True
-        ][:25]
+            for name in self.projects.search(current.strip())
+            if len(value := prefix + name) <= 100
+        ]
 
 
 async def setup(bot: HelpCenterBot) -> None:
@@ -1,35 +1,56 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import os
-import re
+import time
 from functools import partial
-from typing import TYPE_CHECKING, Literal, cast
+from typing import TYPE_CHECKING, Any, Literal, cast
 
 import aiohttp
 import discord
 from discord import SelectOption, app_commands, ui
-from discord.ext import commands
+from discord.ext import commands, tasks
 from typing_extensions import Self  # TODO: remove on 3.11 release
 
-from utils.api.gist import create_new_gist, delete_gist
+from utils import text_stream, token_scanner
+from utils.api.gist import create_gist, create_new_gist, delete_gist
+from utils.cache import TTLCache
 from utils.constants import BUG_CENTER_ID
 from utils.custom_errors import CustomError
+from utils.separators import SeparatorLayout
+from utils.work_queue import WorkQueue
 
 if TYPE_CHECKING:
-    from re import Pattern
-
     from main import HelpCenterBot
 
 
 GIST_TOKEN = os.environ["GIST_TOKEN"]
+TOKEN_VERDICTS_TTL = 60 * 60  # Seconds a token check result is reused
+GIST_MAX_SIZE = int(tmp) if (tmp := os.getenv("GIST_MAX_SIZE")) and tmp.isdigit() else 1 << 20  # In bytes
+GIST_CHUNK_SIZE = 64 * 1024
+SEPARATOR_ROLE_NAME = "━━━━━━━━━━━━━━━ㅤ"
+# Separators are reconciled for every member at startup, then every SEPARATORS_RECONCILE_INTERVAL hours.
+SEPARATORS_RECONCILE_INTERVAL: float = (
+    float(tmp) if (tmp := os.getenv("SEPARATORS_RECONCILE_INTERVAL")) and tmp.isdigit() else 24
+)
+SEPARATORS_CONCURRENCY = 2
+TOKEN_GIST_LIFETIME = 30  # Seconds before a gist used to reset a token is deleted
+
+TokenVerdict = Literal["bot", "user", "invalid"]
 
 
 class Miscellaneous(commands.Cog):
     def __init__(self, bot: HelpCenterBot) -> None:
         """Miscellaneous will check for files in messages and will convert is as gist, and will also check for discord tokens."""
         self.bot: HelpCenterBot = bot
-        self.re_token: Pattern[str] = re.compile(r"[\w\-=]{24}\.[\w\-=]{6}\.[\w\-=]{27}", re.ASCII)
+        # By the sha256 of the tokens, so they are not kept in memory.
+        self.token_verdicts: TTLCache[bytes, TokenVerdict] = TTLCache(max_size=1024, ttl=TOKEN_VERDICTS_TTL)
+        self.bot.scheduler.register("delete_gist", self.delete_gist_job)
+        self._separator_layout: SeparatorLayout[discord.Role] | None = None
+        self._separators_reconciliation: asyncio.Task[WorkQueue[discord.Member]] | None = None
+        self.separators_queue: WorkQueue[discord.Member] | None = None  # The last (or current) reconciliation
+        self.periodic_separators_reconciliation.start()
 
         self.attachement_to_gist_ctx_menu = app_commands.ContextMenu(
             name="Make a gist", callback=self.attachement_to_gist
@@ -39,6 +60,9 @@ class Miscellaneous(commands.Cog):
             guild=discord.Object(id=BUG_CENTER_ID),
         )
 
+    async def cog_unload(self) -> None:
+        self.periodic_separators_reconciliation.cancel()
+
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message) -> None:
         """Look for discord token on message received."""
@@ -64,7 +88,8 @@ class Miscellaneous(commands.Cog):
                     options=[
                         SelectOption(label=attachment.filename, value=str(i))
                         for i, attachment in enumerate(message.attachments)
-                    ]
+                    ],
+                    max_values=len(message.attachments),
                 )
                 async def select_file(
                     self,
@@ -77,27 +102,27 @@ class Miscellaneous(commands.Cog):
 
             view = SelectFileView()
             await inter.response.send_message(
-                "Sélectionnez le fichier que vous souhaitez envoyer sur gist.",
+                "Sélectionnez les fichiers que vous souhaitez envoyer sur gist.",
                 view=view,
                 ephemeral=True,
             )
             await view.wait()
             inter = view.inter
 
-            attachment = message.attachments[int(view.select.values[0])]
+            attachments = [message.attachments[int(value)] for value in view.select.values]
         else:
-            attachment = message.attachments[0]
+            attachments = [message.attachments[0]]
 
-        file = await message.attachments[0].read()
+        # Checked with the metadata of the attachments, before anything is downloaded.
+        if sum(attachment.size for attachment in attachments) > GIST_MAX_SIZE:
+            raise CustomError(f"Les fichiers ne doivent pas dépasser {GIST_MAX_SIZE // 1024} Ko au total.")
+        if binaries := [a.filename for a in attachments if text_stream.is_binary_content_type(a.content_type)]:
+            raise CustomError(f"Ces fichiers ne sont pas des fichiers texte : {', '.join(binaries)}.")
+        if len({attachment.filename for attachment in attachments}) != len(attachments):
+            raise CustomError("Les fichiers d'un gist doivent avoir des noms différents.")
 
-        try:
-            file_content = file.decode("utf-8")
-        except UnicodeDecodeError:
-            return
-
-        if txt := (os.path.splitext(attachment.filename)[1] != ".txt"):
-            file_name = attachment.filename
-        else:
+        file_names = [attachment.filename for attachment in attachments]
+        if any(os.path.splitext(file_name)[1] == ".txt" for file_name in file_names):
 
             class SelectExtension(ui.Modal, title="Quel est l'extension du fichier ?"):
                 inter: discord.Interaction
@@ -119,11 +144,24 @@ class Miscellaneous(commands.Cog):
             inter = modal.inter
 
             ext = cast(str, modal.extension.value)
-            file_name = attachment.filename[: -4 * txt] + ext[ext.startswith(".") :]
+            ext = ext[ext.startswith(".") :]
+            file_names = [
+                file_name[:-4] + "." + ext if os.path.splitext(file_name)[1] == ".txt" else file_name
+                for file_name in file_names
+            ]
 
         await inter.response.defer(ephemeral=True, thinking=True)
         try:
-            json_response = await create_new_gist(GIST_TOKEN, file_name, file_content)
+            contents = await asyncio.gather(*(self.read_attachment(attachment) for attachment in attachments))
+        except text_stream.NotTextError:
+            raise CustomError("Seuls les fichiers texte (UTF-8) peuvent être envoyés sur gist.")
+        except text_stream.TooLargeError:
+            raise CustomError(f"Les fichiers ne doivent pas dépasser {GIST_MAX_SIZE // 1024} Ko au total.")
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            raise CustomError("Impossible de télécharger le fichier.")
+
+        try:
+            json_response = await create_gist(self.bot.http_service, GIST_TOKEN, dict(zip(file_names, contents)))
             json_response["html_url"]
         except Exception:
             raise CustomError("Impossible de créer le gist.")
@@ -135,105 +173,188 @@ class Miscellaneous(commands.Cog):
         )
         await strategy(content="Un gist a été créé :\n" + f"<{json_response['html_url']}>")
 
+    async def read_attachment(self, attachment: discord.Attachment) -> str:
+        """Download the attachment by chunks and decode it, stopping as soon as it can't be text."""
+        async with self.bot.http_service.get(attachment.url, endpoint="discord attachments") as response:
+            response.raise_for_status()
+            return await text_stream.read_text(response.content.iter_chunked(GIST_CHUNK_SIZE), GIST_MAX_SIZE)
+
     async def token_revoke(self, message: discord.Message) -> Literal[True] | None:
-        tokens_places = [message.clean_content]
-
-        for embed in message.embeds:
-            tokens_places.append(str(embed.author))
-            tokens_places.append(str(embed.description))
-            tokens_places.append(str(embed.footer))
-            tokens_places.append(str(embed.title))
-            tokens_places.append(str(embed.url))
-            tokens_places.append(str(embed.image.url))
-            for field in embed.fields:
-                tokens_places.append(str(field.name))
-                tokens_places.append(str(field.value))
-
-        for place in tokens_places:
-            if await self.search_for_token(message, place):
+        for candidate in token_scanner.scan(token_scanner.message_text(message)):
+            if not token_scanner.is_plausible(candidate):  # Most false positives stop here, without network I/O
+                continue
+
+            key = hashlib.sha256(candidate.token.encode()).digest()
+            if (verdict := self.token_verdicts.get(key)) is None:
+                verdict = await self.check_token(candidate)
+                if verdict is None:  # Discord could not answer, it will be checked again next time
+                    continue
+                self.token_verdicts.set(key, verdict)
+
+            if verdict == "bot":
+                # The token is reset by the gist below. Set first, so the messages received meanwhile don't warn again.
+                self.token_verdicts.set(key, "invalid")
+                try:
+                    await self.warn_bot_token(message, candidate)
+                except Exception:
+                    self.token_verdicts.set(key, "bot")  # Not reset, the next message will try again
+                    raise
+                return True
+            if verdict == "user":
+                await self.warn_user_token(message)
                 return True
 
-    async def search_for_token(self, message: discord.Message, text: str) -> bool:
-        if not (match := self.re_token.search(text)):
-            return False
-        headers = {"Authorization": f"Bot {match.group(0)}"}
-        url = "https://discord.com/api/v10/users/@me"
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(url=url) as response:
-                if response.status == 200:
-                    await message.delete()
-                    response_dict = await response.json()
-
-                    message_content = f"**{message.author.mention} Vous venez d'envoyer un token de bot valide.**\n"
-                    message_content += (
-                        f"Celui là a été réinitialisé automatiquement, mais réinitialisez-le aussi vous même sur le "
-                        f"**portail dev** (https://discord.com/developers/applications/{response_dict['id']}).\n"
-                    )
-
-                    await message.channel.send(
-                        message_content,
-                        allowed_mentions=discord.AllowedMentions(users=True),
-                    )
-
-                    gist = await create_new_gist(GIST_TOKEN, "token revoke", match.group(0))
-                    await asyncio.sleep(30)
-                    await delete_gist(GIST_TOKEN, gist["id"])
-                    return True
-
-        # Check if it is eventually a user token.
-        url = "https://discord.com/api/v10/users/@me"
-        headers = {"Authorization": match.group(0)}
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(url=url) as response:
-                if response.status == 200:
-                    await message.delete()
-                    text = (
-                        f"{message.author.mention} vous venez d'envoyer un **token utilisateur**.\n"
-                        "**Qu'est-ce que c'est ? ** C'est une sorte de mot de passe qui autorise à contrôler votre compte.\n"
-                        "**Changez immédiatement votre mot de passe par précaution**.\n"
-                        "Nous vous conseillons aussi d'activer **l'authentification à double facteur (2FA)** si c'est n'est pas encore fait.\n"
-                    )
-                    await message.channel.send(
-                        text,
-                        allowed_mentions=discord.AllowedMentions(users=True),
-                    )
-                    return True
-
-        return False
+    async def check_token(self, candidate: token_scanner.TokenCandidate) -> TokenVerdict | None:
+        """Ask Discord whether the token is valid, with a single request. Return None if Discord didn't answer."""
+        if (user := self.bot.get_user(candidate.user_id)) is None:
+            try:
+                user = await self.bot.fetch_user(candidate.user_id)
+            except discord.NotFound:
+                return "invalid"
+            except discord.HTTPException:
+                return None
+
+        authorization = f"Bot {candidate.token}" if user.bot else candidate.token
+        try:
+            response = await self.bot.http_service.fetch(
+                "GET", "https://discord.com/api/v10/users/@me", headers={"Authorization": authorization}, attempts=1
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return None
+        if response.status == 200:
+            return "bot" if user.bot else "user"
+        if response.status == 401:
+            return "invalid"
+        return None
+
+    async def warn_bot_token(self, message: discord.Message, candidate: token_scanner.TokenCandidate) -> None:
+        await message.delete()
+
+        message_content = f"**{message.author.mention} Vous venez d'envoyer un token de bot valide.**\n"
+        message_content += (
+            f"Celui là a été réinitialisé automatiquement, mais réinitialisez-le aussi vous même sur le "
+            f"**portail dev** (https://discord.com/developers/applications/{candidate.user_id}).\n"
+        )
 
-    @commands.Cog.listener()
-    async def on_member_update(self, old_member: discord.Member, new_member: discord.Member) -> None:
-        if new_member.guild.id != BUG_CENTER_ID:
-            return
-        if len(new_member.roles) == 1:
-            return
+        await message.channel.send(
+            message_content,
+            allowed_mentions=discord.AllowedMentions(users=True),
+        )
 
-        all_separator_roles: list[discord.Role] = [
-            role for role in new_member.guild.roles[1:] if role.name == "━━━━━━━━━━━━━━━ㅤ"
-        ]
+        # Discord resets the tokens published on GitHub, the gist is deleted once it has been scanned.
+        gist = await create_new_gist(self.bot.http_service, GIST_TOKEN, "token revoke", candidate.token)
+        self.bot.scheduler.schedule("delete_gist", TOKEN_GIST_LIFETIME, gist_id=gist["id"])
 
-        separator_roles: list[discord.Role] = [
-            role for role in all_separator_roles if role.position > new_member.roles[1].position
-        ]
-        needed_separators: list[discord.Role] = []
+    async def delete_gist_job(self, data: dict[str, Any]) -> None:
+        await delete_gist(self.bot.http_service, GIST_TOKEN, data["gist_id"])
 
-        member_roles: list[discord.Role] = [role for role in new_member.roles[1:] if role not in separator_roles]
+    async def warn_user_token(self, message: discord.Message) -> None:
+        await message.delete()
+        text = (
+            f"{message.author.mention} vous venez d'envoyer un **token utilisateur**.\n"
+            "**Qu'est-ce que c'est ? ** C'est une sorte de mot de passe qui autorise à contrôler votre compte.\n"
+            "**Changez immédiatement votre mot de passe par précaution**.\n"
+            "Nous vous conseillons aussi d'activer **l'authentification à double facteur (2FA)** si c'est n'est pas encore fait.\n"
+        )
+        await message.channel.send(
+            text,
+            allowed_mentions=discord.AllowedMentions(users=True),
+        )
 
-        for member_role in member_roles:
-            if not separator_roles:
-                break
+    @property
+    def separator_layout(self) -> SeparatorLayout[discord.Role]:
+        """The separator roles of the guild, computed once and invalidated when the guild roles change."""
+        if self._separator_layout is None:
+            guild = cast(discord.Guild, self.bot.get_guild(BUG_CENTER_ID))
+            self._separator_layout = SeparatorLayout(role for role in guild.roles if role.name == SEPARATOR_ROLE_NAME)
+        return self._separator_layout
 
-            if member_role.position > separator_roles[0].position:
-                needed_separators.append(separator_roles[0])
-                separator_roles = [role for role in separator_roles if role.position > member_role.position]
+    @commands.Cog.listener("on_guild_role_create")
+    @commands.Cog.listener("on_guild_role_delete")
+    async def invalidate_separator_layout(self, role: discord.Role) -> None:
+        if role.guild.id == BUG_CENTER_ID:
+            self._separator_layout = None
 
-        roles_to_add: set[discord.Role] = set(needed_separators) - set(new_member.roles)
-        roles_to_remove: set[discord.Role] = set(all_separator_roles) & set(new_member.roles) - set(needed_separators)
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role) -> None:
+        if after.guild.id == BUG_CENTER_ID and (before.position != after.position or before.name != after.name):
+            self._separator_layout = None
 
+    @commands.Cog.listener()
+    async def on_member_update(self, old_member: discord.Member, new_member: discord.Member) -> None:
+        if new_member.guild.id != BUG_CENTER_ID:
+            return
+        if old_member.roles == new_member.roles:  # Nickname, avatar, timeout... updates
+            return
+        await self.update_separators(new_member)
+
+    def separator_changes(self, member: discord.Member) -> tuple[set[discord.Role], set[discord.Role]]:
+        """Return the separators to add to and to remove from the member."""
+        layout = self.separator_layout
+        member_roles = member.roles[1:]
+        needed_separators = layout.needed(member_roles)
+        current_separators = {role for role in member_roles if role.id in layout.ids}
+        return needed_separators - current_separators, current_separators - needed_separators
+
+    async def update_separators(self, member: discord.Member, reason: str | None = None) -> None:
+        # add_roles and remove_roles only change the given roles, unlike an edit of the whole list of roles which would
+        # revert the changes made by others since the member was cached.
+        roles_to_add, roles_to_remove = self.separator_changes(member)
         if roles_to_add:
-            await new_member.add_roles(*roles_to_add)
+            await member.add_roles(*roles_to_add, reason=reason)
         if roles_to_remove:
-            await new_member.remove_roles(*roles_to_remove)
+            await member.remove_roles(*roles_to_remove, reason=reason)
+
+    async def fix_member_separators(self, member: discord.Member) -> None:
+        # The cached member is used again, it may have changed since it was queued.
+        if (member := member.guild.get_member(member.id)) is not None:
+            await self.update_separators(member, reason="Separator roles reconciliation.")
+
+    def start_separators_reconciliation(self) -> asyncio.Task[WorkQueue[discord.Member]]:
+        """Fix the separators of every member of the guild, unless it is already being done."""
+        if self._separators_reconciliation is None or self._separators_reconciliation.done():
+            self.separators_queue = None
+            self._separators_reconciliation = asyncio.create_task(self.reconcile_separators())
+        return self._separators_reconciliation
+
+    async def reconcile_separators(self) -> WorkQueue[discord.Member]:
+        guild = cast(discord.Guild, self.bot.get_guild(BUG_CENTER_ID))
+        # Every member is cached (see chunk_guilds_at_startup), only the ones with wrong separators are queued.
+        members = [member for member in guild.members if any(self.separator_changes(member))]
+
+        # discord.py waits for the rate limits itself, few workers are enough and leave room for other requests.
+        self.separators_queue = WorkQueue(self.fix_member_separators, SEPARATORS_CONCURRENCY, self.bot.logger)
+        await self.separators_queue.run(members)
+        self.bot.logger.info(f"Separator roles reconciled for {len(guild.members)} members: {self.separators_queue}.")
+        return self.separators_queue
+
+    @tasks.loop(hours=SEPARATORS_RECONCILE_INTERVAL)
+    async def periodic_separators_reconciliation(self) -> None:
+        await self.start_separators_reconciliation()
+
+    @periodic_separators_reconciliation.before_loop
+    async def before_separators_reconciliation(self) -> None:
+        await self.bot.wait_until_ready()
+
+    @app_commands.command()
+    @app_commands.guilds(BUG_CENTER_ID)
+    @app_commands.default_permissions(manage_roles=True)
+    async def resync_separators(self, inter: discord.Interaction) -> None:
+        """Fix the separator roles of every member."""
+        await inter.response.defer(ephemeral=True)
+        task = self.start_separators_reconciliation()
+
+        # The interaction can be edited for 15 minutes, the reconciliation goes on in the background after that.
+        deadline = time.monotonic() + 14 * 60
+        while not task.done() and time.monotonic() < deadline:
+            if (queue := self.separators_queue) is not None:
+                await inter.edit_original_response(content=f"Reconciliation in progress: {queue}.")
+            await asyncio.wait({task}, timeout=5)
+
+        if task.done() and not task.cancelled() and task.exception() is None:
+            await inter.edit_original_response(content=f"Reconciliation done: {task.result()}.")
+        elif task.done():
+            await inter.edit_original_response(content="Reconciliation failed.")
 
 
 async def setup(bot: HelpCenterBot) -> None:
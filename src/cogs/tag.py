@@ -1,25 +1,58 @@
 from __future__ import annotations
 
 import asyncio
-import io
+import hashlib
+import hmac
 import os
-from typing import TYPE_CHECKING, Any
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Iterable, cast
 
 import aiohttp
 import discord
 import tomli  # TODO: use builtin with python 3.11
+from aiohttp import web
 from discord import Embed, File, app_commands
 from discord.ext import commands, tasks
 from pydantic import AnyHttpUrl, BaseModel, Extra, Field, root_validator
 
+from utils.blob_cache import BlobCache
+from utils.coalescer import Coalescer
 from utils.constants import BUG_CENTER_ID
 from utils.custom_errors import CustomError
+from utils.search import SearchIndex
+from utils.snapshot import Snapshot
 
 if TYPE_CHECKING:
     from main import HelpCenterBot
 
 
 REPOSITORY_TOKEN = os.environ["GITHUB_REPOSITORY_TOKEN"]
+TAGS_REPOSITORY = "discord-bugcenter/tags"
+TAGS_DIRECTORY = "src"
+
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_RAW_URL = "https://raw.githubusercontent.com"
+COMPARE_FILES_LIMIT = 300  # The compare API doesn't list more than 300 files
+FETCH_CONCURRENCY = int(tmp) if (tmp := os.getenv("TAGS_FETCH_CONCURRENCY")) and tmp.isdigit() else 16
+SNAPSHOT_DIRECTORY = os.getenv("TAGS_SNAPSHOT_DIRECTORY", "data/tags")
+SNAPSHOT_VERSION = 1
+ATTACHMENTS_CACHE_SIZE = int(tmp) if (tmp := os.getenv("TAGS_ATTACHMENTS_CACHE_SIZE")) and tmp.isdigit() else 64 << 20
+ATTACHMENTS_MMAP = os.getenv("TAGS_ATTACHMENTS_MMAP", "").lower() in ("1", "true", "yes")
+
+POLL_INTERVAL = 60  # In seconds, when everything goes well
+MAX_POLL_INTERVAL = 30 * 60
+# The push webhook is enabled only if both the port and the secret are set.
+WEBHOOK_PORT = int(tmp) if (tmp := os.getenv("TAGS_WEBHOOK_PORT")) and tmp.isdigit() else None
+WEBHOOK_SECRET = os.getenv("TAGS_WEBHOOK_SECRET")
+
+TAG_EMBED_COLOR = discord.Color.from_rgb(47, 49, 54)
+TAG_EMBED_FOOTER = "Les tags sont fait par la communauté, n'hésitez pas à en proposer."
+
+
+def is_tag_path(path: str) -> bool:
+    """Tags are stored as `src/<category>/<tag file>` in the repository."""
+    parts = path.split("/")
+    return len(parts) == 3 and parts[0] == TAGS_DIRECTORY
 
 
 # Payload objects
@@ -60,42 +93,55 @@ class TagPayload(BaseModel, extra=Extra.forbid):
         return values
 
 
+def parse_tag_payload(raw_tag: str) -> TagPayload:
+    """Parse and validate a tag file. This is CPU bound, and is meant to be run in a thread."""
+    return TagPayload.parse_obj(tomli.loads(raw_tag))
+
+
 # Tag object parsed
 
 
 class Tag:
-    __slots__ = ("name", "description", "content", "_embeds", "_attachments", "attachments", "category")
+    __slots__ = (
+        "payload",
+        "name",
+        "description",
+        "content",
+        "embeds",
+        "_attachments",
+        "attachments_digests",
+        "category",
+    )
 
     def __init__(self, data: TagPayload, category: str) -> None:
+        self.payload: TagPayload = data
         self.name: str = data.name
         self.description: str = data.description
         self.content: str | None = data.content
-        self._embeds: list[TagEmbedPayload] = data.embeds
+        self.embeds: tuple[Embed, ...] = self.compile_embeds(data.embeds)  # Built once, and sent as is
         self._attachments: list[TagAttachmentsPayload] = data.attachments
+        self.attachments_digests: list[str] = []  # The attachments content, stored in a BlobCache
         self.category: str = category
 
-    async def get_attachments(self) -> None:
-        self.attachments: list[File] = []
-        for attachment_payload in self._attachments:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(attachment_payload.url) as response:
-                    buffer = io.BytesIO(await response.read())
-                    buffer.seek(0)
-
-                    self.attachments.append(
-                        File(
-                            buffer,
-                            attachment_payload.filename,
-                            description=attachment_payload.description,
-                        )
-                    )
-
-    @property
-    def embeds(self) -> list[Embed]:
+    async def get_attachments(self, download: Callable[[str], Awaitable[str]]) -> None:
+        """Download the attachments using the given function, that returns the digest of the downloaded content."""
+        self.attachments_digests = list(await asyncio.gather(*(download(a.url) for a in self._attachments)))
+
+    def get_files(self, blob_cache: BlobCache) -> list[File] | None:
+        """Return new files over the cached attachments, or None if an attachment is not cached anymore."""
+        files: list[File] = []
+        for digest, attachment_payload in zip(self.attachments_digests, self._attachments):
+            if (reader := blob_cache.open(digest)) is None:
+                return None
+            files.append(File(reader, attachment_payload.filename, description=attachment_payload.description))
+        return files
+
+    @staticmethod
+    def compile_embeds(embeds_payloads: list[TagEmbedPayload]) -> tuple[Embed, ...]:
         embeds: list[Embed] = []
 
-        for embed_payload in self._embeds:
-            embed = Embed(title=embed_payload.title, description=embed_payload.description)
+        for embed_payload in embeds_payloads:
+            embed = Embed(title=embed_payload.title, description=embed_payload.description, color=TAG_EMBED_COLOR)
             for field in embed_payload.fields:
                 embed.add_field(name=field.name, value=field.value, inline=field.inline)
             if embed_payload.image:
@@ -105,76 +151,330 @@ class Tag:
 
             embeds.append(embed)
 
-        return embeds
+        if embeds:
+            embeds[-1].set_footer(text=TAG_EMBED_FOOTER)
+        return tuple(embeds)
 
 
 class TagCog(commands.Cog):
     def __init__(self, bot: HelpCenterBot) -> None:
         """Tag command allow you to search for help in pre-saved topics."""
         self.bot: HelpCenterBot = bot
-        self.last_sha_commit: str | None = None
+        self.last_sha_commit: str | None = None  # The commit the loaded tags come from
         self.tags: dict[str, list[Tag]] = {}  # A dict which looks like {"category_name": [Tag, ...]}}
+        self.tags_by_identifier: dict[str, Tag] = {}  # A dict which looks like {"category_name.tag_name": Tag}
+        self._tags_by_path: dict[str, Tag] = {}  # Every loaded tag, indexed by its path in the repository
+        self.search_index: SearchIndex[Tag] = SearchIndex((), name=lambda tag: tag.name)
+        self._sync_lock = asyncio.Lock()
         self.bot.tree.add_command(self._tag, guild=discord.Object(id=BUG_CENTER_ID))
         self.bot.tree.add_command(self._force_resync, guild=discord.Object(id=BUG_CENTER_ID))
 
-        headers = {"Authorization": f"token {REPOSITORY_TOKEN}"}
-        self.session = aiohttp.ClientSession(headers=headers)
+        # Only sent to GitHub, attachments are hosted elsewhere and must not get the token.
+        self.github_headers = {"Authorization": f"token {REPOSITORY_TOKEN}"}
+        self.semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)  # Shared by every download of the tags loading
+        self._downloads: dict[str, asyncio.Task[str]] = {}  # Attachments being downloaded, by URL
+        self._head_sha: str | None = None
+        self._commits_etag: str | None = None  # Unchanged commits are answered with a 304, which is free
+        self.poll_interval: float = POLL_INTERVAL
+        self._webhook_runner: web.AppRunner | None = None
+        # The poller and the push webhook sync through it, so their syncs never overlap and bursts of pushes are merged.
+        self._target_sha: str | None = None
+        self.syncer = Coalescer(self.sync_target, 0, self.bot.logger)
+
+        # Tags from the last run are available immediately, and are then updated in the background.
+        self.snapshot = Snapshot(SNAPSHOT_DIRECTORY)
+        # Attachments are shared between tags, and are kept in the snapshot blobs so evicted ones can be read again.
+        self.blob_cache = BlobCache(ATTACHMENTS_CACHE_SIZE, self.snapshot.blobs_directory, use_mmap=ATTACHMENTS_MMAP)
+        self.load_snapshot()
         self.check_for_changes.start()
 
+    async def cog_load(self) -> None:
+        if WEBHOOK_PORT is None or not WEBHOOK_SECRET:
+            return
+
+        app = web.Application()
+        app.router.add_post("/tags-webhook", self.handle_push_webhook)
+        self._webhook_runner = web.AppRunner(app, access_log=None)
+        await self._webhook_runner.setup()
+        await web.TCPSite(self._webhook_runner, port=WEBHOOK_PORT).start()
+        self.bot.logger.info(f"Listening for tags repository pushes on port {WEBHOOK_PORT}.")
+
     async def cog_unload(self) -> None:
-        await self.session.close()
+        self.check_for_changes.cancel()
+        if self._webhook_runner is not None:
+            await self._webhook_runner.cleanup()
 
     @commands.Cog.listener()
     async def on_ready(self) -> None:
-        await self.fetch_tags()
-
-    @tasks.loop(minutes=1)
-    async def check_for_changes(self) -> None:
-        async with self.session.get("https://api.github.com/repos/discord-bugcenter/tags/commits") as r:
-            raw_data = await r.json()
-            last_sha = raw_data[0]["sha"]
+        await self.sync_tags()
 
-        if self.last_sha_commit is not None and self.last_sha_commit != last_sha:
-            self.last_sha_commit = last_sha
-            await asyncio.sleep(300)  # Raws are cached for 5 minutes, so we need to wait before fetching again
-            await self.fetch_tags()
-        else:
-            self.last_sha_commit = last_sha
-
-    async def fetch_tags(self) -> None:
-        self.tags = {}
-        async with self.session.get("https://api.github.com/repositories/472858036/contents/src") as r:
-            raw_categories = await r.json()
+    async def handle_push_webhook(self, request: web.Request) -> web.Response:
+        """Endpoint for the GitHub push webhook of the tags repository, to resync as soon as something is pushed."""
+        body = await request.read()
+        signature = "sha256=" + hmac.new(cast(str, WEBHOOK_SECRET).encode(), body, hashlib.sha256).hexdigest()
+        if not hmac.compare_digest(signature, request.headers.get("X-Hub-Signature-256", "")):
+            return web.Response(status=401)
 
-        for raw_category in raw_categories:
-            category_tags: list[Tag] = []
-            category = raw_category["name"]
+        if request.headers.get("X-GitHub-Event") != "push":
+            return web.Response(status=204)  # Pings and other events
 
-            async with self.session.get(raw_category["url"]) as r:
-                raw_tags = await r.json()
+        payload = await request.json()
+        if payload["ref"] != f"refs/heads/{payload['repository']['default_branch']}":
+            return web.Response(status=204)
 
-            for raw_tag in raw_tags:
-                try:
-                    async with self.session.get(raw_tag["download_url"]) as r:
-                        tag_payload = TagPayload.parse_obj(tomli.loads(await r.text()))
-                    tag = Tag(tag_payload, category)
+        if self.last_sha_commit is not None:  # Otherwise, the initial loading will take the last commit anyway
+            self.request_sync(payload["after"])
+        return web.Response(status=202)
 
-                    if any(tag.name == _tag.name for _tag in category_tags):
-                        raise ValueError(f"{tag.name} ({raw_tag['path']}) is already a tag")
-
-                    await tag.get_attachments()
-                    category_tags.append(tag)
-                    self.bot.logger.debug(f"Tag {tag.name} from {tag.category} ({raw_tag['path']}) successfully loaded")
+    @tasks.loop(seconds=POLL_INTERVAL)
+    async def check_for_changes(self) -> None:
+        try:
+            last_sha = await self.get_head_sha()
+            # Also done if the initial loading failed (without a snapshot, no tag is loaded until then).
+            if self.last_sha_commit != last_sha:
+                self.request_sync(last_sha)
+                await self.syncer.wait()
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, LookupError, TypeError) as e:
+            # Unexpected bodies (invalid JSON, no commit...) are retried later too, an error would stop the loop.
+            if not isinstance(e, aiohttp.ClientResponseError):  # Otherwise, handle_rate_limit already did it
+                self.set_poll_interval(self.poll_interval * 2)
+            self.bot.logger.warning(f"Cannot check the tags repository, next try in {self.poll_interval}s. Error : {e}")
+
+    def request_sync(self, sha: str) -> None:
+        self._target_sha = sha
+        self.syncer.trigger()
+
+    async def sync_target(self) -> None:
+        await self.sync_tags(self._target_sha)
+
+    def set_poll_interval(self, seconds: float) -> None:
+        self.poll_interval = min(max(seconds, POLL_INTERVAL), MAX_POLL_INTERVAL)
+        self.check_for_changes.change_interval(seconds=self.poll_interval)
+
+    def handle_rate_limit(self, response: aiohttp.ClientResponse) -> None:
+        """Slow the poller down if GitHub asks for it or if it fails, and use the normal pace otherwise."""
+        headers = response.headers
+        if retry_after := headers.get("Retry-After"):
+            self.set_poll_interval(float(retry_after))
+        elif headers.get("X-RateLimit-Remaining") == "0" and (reset := headers.get("X-RateLimit-Reset")):
+            self.set_poll_interval(float(reset) - time.time())
+        elif response.status >= 400:
+            self.set_poll_interval(self.poll_interval * 2)
+        else:
+            self.set_poll_interval(POLL_INTERVAL)
+
+    async def get_head_sha(self) -> str:
+        headers = self.github_headers.copy()
+        if self._commits_etag and self._head_sha:
+            headers["If-None-Match"] = self._commits_etag
+        async with self.bot.http_service.get(
+            f"{GITHUB_API_URL}/repos/{TAGS_REPOSITORY}/commits",
+            params={"per_page": "1"},
+            headers=headers,
+            endpoint="github commits",
+        ) as r:
+            self.handle_rate_limit(r)
+            if r.status == 304:
+                return cast(str, self._head_sha)
+            r.raise_for_status()
 
-                except Exception as e:
-                    self.bot.logger.warning(f'The tag {raw_tag["path"]} cannot be loaded. Error : {e}')
-                    continue
+            raw_data = await r.json()
+            self._commits_etag = r.headers.get("ETag")
+
+        self._head_sha = raw_data[0]["sha"]
+        return raw_data[0]["sha"]
+
+    async def sync_tags(self, sha: str | None = None, *, full: bool = False) -> None:
+        """Bring the loaded tags to the given commit (or the latest one), only fetching what changed if possible."""
+        async with self._sync_lock:
+            sha = sha or await self.get_head_sha()
+            if self.last_sha_commit is None or full:
+                await self.fetch_tags(sha)
+            elif self.last_sha_commit != sha:
+                await self.update_tags(sha)
+            else:
+                return
+
+            try:
+                await asyncio.to_thread(self.save_snapshot)
+            except OSError as e:
+                self.bot.logger.warning(f"The tags snapshot cannot be saved. Error : {e}")
+
+    def load_snapshot(self) -> None:
+        start = time.perf_counter()
+        if (index := self.snapshot.load()) is None or index.get("version") != SNAPSHOT_VERSION:
+            return
 
-            self.tags[category] = category_tags
+        try:
+            tags_by_path: dict[str, Tag] = {}
+            for path, raw_tag in index["tags"].items():
+                if missing := [digest for digest in raw_tag["attachments"] if digest not in self.blob_cache]:
+                    raise ValueError(f"The attachments {', '.join(missing)} of {path} are missing")
+                tag = Tag(TagPayload.parse_obj(raw_tag["payload"]), path.split("/")[1])
+                tag.attachments_digests = raw_tag["attachments"]
+                tags_by_path[path] = tag
+        except Exception as e:
+            self.bot.logger.warning(f"The tags snapshot cannot be loaded. Error : {e}")
+            return
+
+        self.swap_tags(tags_by_path, index["sha"])
+        self.bot.logger.info(
+            f"{len(tags_by_path)} tags loaded from the snapshot of {index['sha']} "
+            f"in {time.perf_counter() - start:.3f}s."
+        )
+
+    def save_snapshot(self) -> None:
+        """Save the loaded tags and their attachments. This does blocking IO, and is meant to be run in a thread."""
+        tags_by_path, sha = self._tags_by_path, self.last_sha_commit
+
+        # Attachments are already in the blobs directory, see download_attachment.
+        raw_tags = {
+            path: {"payload": tag.payload.dict(), "attachments": tag.attachments_digests}
+            for path, tag in tags_by_path.items()
+        }
+        self.snapshot.save({"version": SNAPSHOT_VERSION, "sha": sha, "tags": raw_tags})
+        self.snapshot.prune_blobs({digest for raw_tag in raw_tags.values() for digest in raw_tag["attachments"]})
+
+    async def load_tag_payload(self, path: str, sha: str) -> TagPayload | None:
+        # Raws are requested for a specific commit, so they are never outdated by the 5 minutes cache.
+        try:
+            async with self.semaphore:
+                response = await self.bot.http_service.fetch(
+                    "GET",
+                    f"{GITHUB_RAW_URL}/{TAGS_REPOSITORY}/{sha}/{path}",
+                    headers=self.github_headers,
+                    endpoint="github raw",
+                )
+            response.raise_for_status()
+            raw_tag = response.text()
+            return await asyncio.to_thread(parse_tag_payload, raw_tag)
+        except Exception as e:
+            self.bot.logger.warning(f"The tag {path} cannot be loaded. Error : {e}")
+            return None
+
+    async def _download_attachment(self, url: str) -> str:
+        async with self.semaphore:
+            response = await self.bot.http_service.fetch("GET", url, endpoint="tag attachments")
+        response.raise_for_status()
+        data = response.body
+
+        await asyncio.to_thread(self.snapshot.put_blob, data)
+        return self.blob_cache.put(data)
+
+    async def download_attachment(self, url: str) -> str:
+        """Download an attachment into the cache and return its digest. Tags with the same attachment share it."""
+        if (task := self._downloads.get(url)) is None:
+            task = self._downloads[url] = asyncio.create_task(self._download_attachment(url))
+            task.add_done_callback(lambda _: self._downloads.pop(url, None))
+        return await asyncio.shield(task)
+
+    async def load_tag_attachments(self, path: str, tag: Tag) -> bool:
+        try:
+            await tag.get_attachments(self.download_attachment)
+        except Exception as e:
+            self.bot.logger.warning(f"The tag {path} cannot be loaded. Error : {e}")
+            return False
+
+        self.bot.logger.debug(f"Tag {tag.name} from {tag.category} ({path}) successfully loaded")
+        return True
+
+    async def load_tags(self, paths: Iterable[str], sha: str) -> dict[str, Tag]:
+        """Download and validate the given tags, then their attachments, with at most FETCH_CONCURRENCY requests."""
+        paths = list(paths)
+
+        start = time.perf_counter()
+        payloads = await asyncio.gather(*(self.load_tag_payload(path, sha) for path in paths))
+        tags = {path: Tag(payload, path.split("/")[1]) for path, payload in zip(paths, payloads) if payload is not None}
+
+        payloads_end = time.perf_counter()
+        loaded = await asyncio.gather(*(self.load_tag_attachments(path, tag) for path, tag in tags.items()))
+        tags = {path: tag for (path, tag), success in zip(tags.items(), loaded) if success}
+
+        self.bot.logger.info(
+            f"{len(tags)}/{len(paths)} tags loaded "
+            f"(payloads: {payloads_end - start:.2f}s, attachments: {time.perf_counter() - payloads_end:.2f}s)."
+        )
+        return tags
+
+    async def fetch_tags(self, sha: str) -> None:
+        """Load every tag of the repository at the given commit."""
+        start = time.perf_counter()
+        response = await self.bot.http_service.fetch(
+            "GET",
+            f"{GITHUB_API_URL}/repos/{TAGS_REPOSITORY}/git/trees/{sha}",
+            params={"recursive": "1"},
+            headers=self.github_headers,
+            endpoint="github tree",
+        )
+        response.raise_for_status()
+        raw_tree = response.json()
+        self.bot.logger.info(f"Tags repository listed in {time.perf_counter() - start:.2f}s.")
+
+        paths = (entry["path"] for entry in raw_tree["tree"] if entry["type"] == "blob" and is_tag_path(entry["path"]))
+        self.swap_tags(await self.load_tags(paths, sha), sha)
+
+    async def update_tags(self, sha: str) -> None:
+        """Reload only the tags added, modified or removed between the loaded commit and the given one."""
+        response = await self.bot.http_service.fetch(
+            "GET",
+            f"{GITHUB_API_URL}/repos/{TAGS_REPOSITORY}/compare/{self.last_sha_commit}...{sha}",
+            headers=self.github_headers,
+            endpoint="github compare",
+        )
+        comparison = response.json() if response.status == 200 else None
+
+        # A diverged history (force-push) or a truncated list of files can't be applied incrementally.
+        if (
+            comparison is None
+            or comparison["status"] not in ("ahead", "identical")
+            or len(comparison["files"]) >= COMPARE_FILES_LIMIT
+        ):
+            self.bot.logger.info(f"Cannot resync tags incrementally from {self.last_sha_commit} to {sha}.")
+            return await self.fetch_tags(sha)
+
+        tags_by_path = self._tags_by_path.copy()
+        to_load: list[str] = []
+        for file in comparison["files"]:
+            if file["status"] == "renamed":
+                tags_by_path.pop(file["previous_filename"], None)
+            if not is_tag_path(path := file["filename"]):
+                continue
+
+            tags_by_path.pop(path, None)
+            if file["status"] != "removed":
+                to_load.append(path)
+
+        tags_by_path.update(await self.load_tags(to_load, sha))
+
+        self.bot.logger.info(f"Tags resynced to {sha} ({len(comparison['files'])} files changed).")
+        self.swap_tags(tags_by_path, sha)
+
+    def swap_tags(self, tags_by_path: dict[str, Tag], sha: str) -> None:
+        """Replace the loaded tags at once, so the commands never see a partially loaded state."""
+        tags: dict[str, list[Tag]] = {}
+        for path, tag in sorted(tags_by_path.items()):
+            category_tags = tags.setdefault(tag.category, [])
+            if any(tag.name == _tag.name for _tag in category_tags):
+                self.bot.logger.warning(f"The tag {path} cannot be loaded. Error : {tag.name} is already a tag")
+                continue
+            category_tags.append(tag)
+
+        self._tags_by_path = tags_by_path
+        self.tags = tags
+        self.tags_by_identifier = {
+            f"{tag.category}.{tag.name}": tag for tags_list in tags.values() for tag in tags_list
+        }
+        self.search_index = SearchIndex(
+            sorted((tag for tags_list in tags.values() for tag in tags_list), key=lambda tag: (tag.category, tag.name)),
+            name=lambda tag: tag.name,
+            category=lambda tag: tag.category,
+            description=lambda tag: tag.description,
+        )
+        self.last_sha_commit = sha
 
     @app_commands.command(name="force_resync")
     async def _force_resync(self, inter: discord.Interaction) -> None:
-        await self.fetch_tags()
+        await self.sync_tags(full=True)
 
     @app_commands.command(name="tag", description="Envoyer les messages répétitifs.")
     @app_commands.describe(tag_identifier="La catégorie que vous souhaitez sélectionner")
@@ -182,61 +482,25 @@ class TagCog(commands.Cog):
     # @checkers.authorized_channels()
     async def _tag(self, inter: discord.Interaction, tag_identifier: str) -> None:
         """The tag command, that will do a research into saved tags, using the category and the query gave."""
-        try:
-            category_name, tag_name = tag_identifier.split(".")
-            if (tmp := discord.utils.get(self.tags[category_name], name=tag_name)) is None:
-                raise ValueError(f"{tag_name} is not a tag in {category_name}")
-            tag: Tag = tmp
-        except (ValueError, KeyError):
+        if (tag := self.tags_by_identifier.get(tag_identifier)) is None:
             raise CustomError("Select a tag from the list.")
 
-        embeds = tag.embeds
-        if embeds:
-            embeds[-1].set_footer(text="Les tags sont fait par la communauté, n'hésitez pas à en proposer.")
-            for embed in embeds:
-                embed.color = discord.Color.from_rgb(47, 49, 54)
+        if (files := tag.get_files(self.blob_cache)) is None:
+            # The blobs directory has been altered, the attachments must be downloaded again.
+            try:
+                await tag.get_attachments(self.download_attachment)
+            except Exception as e:
+                self.bot.logger.warning(f"The attachments of {tag.category}.{tag.name} cannot be downloaded : {e}")
+            if (files := tag.get_files(self.blob_cache)) is None:
+                raise CustomError("Impossible de charger les pièces jointes de ce tag.")
 
-        await inter.response.send_message(content=tag.content, embeds=embeds, files=tag.attachments)
+        await inter.response.send_message(content=tag.content, embeds=tag.embeds, files=files)
 
     @_tag.autocomplete("tag_identifier")
     async def category_autocompleter(self, inter: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
-        def search_tags(search_text: str) -> list[Tag]:
-            """
-            Return a list of tags that match the search text.
-            Tags whose search_text matches the beginning of the name are placed first,
-            Tags whose search_text is contained in the name are placed next,
-            Tags whose search_text matches the beginning of the category are placed last.
-            """
-            tags_begin_match: set[Tag] = set()
-            tags_contained_match: set[Tag] = set()
-            tags_category_match: set[Tag] = set()
-
-            for category, tags_list in self.tags.items():
-                for tag in tags_list:
-                    if tag.name.startswith(search_text):
-                        tags_begin_match.add(tag)
-                    elif search_text in tag.name:
-                        tags_contained_match.add(tag)
-
-                if category.startswith(search_text):
-                    tags_category_match |= set(tags_list)
-
-            # tags_category_match can contain duplicates, so we remove them
-            tags_category_match = tags_category_match - tags_begin_match - tags_contained_match
-
-            def sort_key(tag: Tag) -> tuple[str, str]:
-                return tag.category, tag.name
-
-            tags = (
-                sorted(tags_begin_match, key=sort_key)
-                + sorted(tags_contained_match, key=sort_key)
-                + sorted(tags_category_match, key=sort_key)
-            )
-            return tags[:25]
-
         return [
             app_commands.Choice(name=f"{tag.name} [{tag.category}]", value=".".join((tag.category, tag.name)))
-            for tag in search_tags(current)
+            for tag in self.search_index.search(current)
         ]
 
 
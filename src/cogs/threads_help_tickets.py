@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import asyncio
+import logging
+import os
 import re
 from datetime import datetime, timedelta, timezone
 from functools import partial
-from typing import TYPE_CHECKING, NamedTuple, cast
+from itertools import islice
+from typing import TYPE_CHECKING, Awaitable, Iterable, cast
 
 import discord
 from discord import app_commands, ui
@@ -12,7 +15,10 @@ from discord.ext import commands
 from discord.utils import find, get
 from typing_extensions import Self
 
+from utils.coalescer import Coalescer
 from utils.constants import BUG_CENTER_ID, NEW_REQUEST_CHANNEL_ID, REQUEST_MESSAGE_ID, REQUESTS_CHANNEL_ID
+from utils.retry import retry
+from utils.ticket_store import TicketStore
 from utils.types import Snowflake
 
 if TYPE_CHECKING:
@@ -21,10 +27,142 @@ if TYPE_CHECKING:
     from main import HelpCenterBot
 
 
-class Request(NamedTuple):
-    request_message_id: Snowflake
-    thread_id: Snowflake
-    user_id: Snowflake | None
+# Thread events are applied at most once every OVERVIEW_WINDOW seconds.
+OVERVIEW_WINDOW: float = float(tmp) if (tmp := os.getenv("REQUESTS_OVERVIEW_WINDOW")) and tmp.isdigit() else 10
+# Messages older than 14 days can't be bulk deleted, a margin is kept for the time the request takes.
+BULK_DELETE_MAX_AGE = timedelta(days=14, minutes=-5)
+DATABASE_PATH = os.getenv("REQUESTS_DATABASE", "data/requests.sqlite3")
+THREAD_CREATED_TIMEOUT = 60  # Seconds a thread_created message is waited for, or kept if nobody waits for it
+# The scheduled event is edited at most once every EVENT_UPDATE_INTERVAL seconds, its edits are heavily rate limited.
+EVENT_UPDATE_INTERVAL: float = (
+    float(tmp) if (tmp := os.getenv("REQUESTS_EVENT_UPDATE_INTERVAL")) and tmp.isdigit() else 300
+)
+EVENT_NAME_PREFIX = "Demandes d'aide : "
+LISTING_ATTEMPTS = 3  # Reconciles that try to list a thread, /resync_requests fixes the ones that still fail
+
+
+def is_retryable(error: Exception) -> bool:
+    """Discord server errors and network errors can succeed on a new try, other errors won't."""
+    if isinstance(error, discord.HTTPException):
+        return error.status >= 500
+    return isinstance(error, (OSError, asyncio.TimeoutError))
+
+
+async def delete_messages(
+    channel: discord.TextChannel, message_ids: Iterable[Snowflake], logger: logging.Logger
+) -> None:
+    """
+    Delete the messages using as few requests as possible: by bulks of 100, or one by one if they are too old.
+    Failures are logged and don't stop the other deletions.
+    """
+    message_ids = sorted(set(message_ids))  # Bulk deletions are rejected if they contain duplicates
+    bulk_limit = discord.utils.time_snowflake(datetime.now(timezone.utc) - BULK_DELETE_MAX_AGE)
+    recent_ids = iter([message_id for message_id in message_ids if message_id > bulk_limit])
+    old_ids = [message_id for message_id in message_ids if message_id <= bulk_limit]
+
+    while chunk := list(islice(recent_ids, 100)):
+        try:
+            await channel.delete_messages([discord.Object(message_id) for message_id in chunk])
+        except discord.NotFound:  # A single message is not bulk deleted, and can have been deleted already
+            pass
+        except discord.HTTPException as e:
+            logger.error(f"{len(chunk)} request messages cannot be deleted. Error : {e}")
+
+    for message_id in old_ids:
+        try:
+            await channel.get_partial_message(message_id).delete()
+        except discord.NotFound:
+            pass
+        except discord.HTTPException as e:
+            logger.error(f"The request message {message_id} cannot be deleted. Error : {e}")
+
+
+class EventCounter:
+    def __init__(self, guild: discord.Guild, location: str, logger: logging.Logger) -> None:
+        """
+        The scheduled event that shows the number of open requests.
+        The count is published at most once per EVENT_UPDATE_INTERVAL, and only if it has changed since the last
+        publication. The event is ended when there are no requests, and created again when needed, including when it
+        has been deleted or ended by someone else.
+        """
+        self.guild: discord.Guild = guild
+        self.location: str = location
+        self.logger: logging.Logger = logger
+
+        self.event: discord.ScheduledEvent | None = find(
+            lambda event: event.name.startswith(EVENT_NAME_PREFIX) and event.status is discord.EventStatus.active,
+            guild.scheduled_events,
+        )
+        self.published_count: int | None = self._parse_count(self.event) if self.event else None
+        self.count: int = 0
+        self.disabled: bool = False
+        self.publisher = Coalescer(self.publish, EVENT_UPDATE_INTERVAL, logger)
+        self._lock = asyncio.Lock()  # Disabling must not interleave with a publication
+
+    @staticmethod
+    def _parse_count(event: discord.ScheduledEvent) -> int | None:
+        count = event.name.removeprefix(EVENT_NAME_PREFIX)
+        return int(count) if count.isdigit() else None
+
+    def set_count(self, count: int) -> None:
+        self.count = count
+        if not self.disabled and count != self.published_count:
+            self.publisher.trigger()
+
+    def forget(self, event_id: Snowflake) -> None:
+        """Called when an event is deleted or ended, so it is created again on the next publication if it was ours."""
+        if self.event is not None and self.event.id == event_id:
+            self.event = None
+            self.published_count = None
+            self.set_count(self.count)
+
+    async def publish(self) -> None:
+        async with self._lock:
+            if self.disabled:
+                return
+
+            count = self.count
+            if count == 0:
+                await self.end()
+            elif self.event is None:
+                await self.create(count)
+            elif count != self.published_count:
+                try:
+                    self.event = await self.event.edit(name=f"{EVENT_NAME_PREFIX}{count}")
+                except discord.NotFound:
+                    self.logger.warning("The requests scheduled event was deleted, creating a new one.")
+                    await self.create(count)
+                else:
+                    self.published_count = count
+
+    async def create(self, count: int) -> None:
+        now = datetime.now(timezone.utc)
+        event = await self.guild.create_scheduled_event(
+            name=f"{EVENT_NAME_PREFIX}{count}",
+            start_time=now + timedelta(minutes=10),
+            entity_type=discord.EntityType.external,
+            location=self.location,
+            end_time=now + timedelta(days=365 * 3),
+        )
+        self.event = await event.start()
+        self.published_count = count
+
+    async def end(self) -> None:
+        event, self.event, self.published_count = self.event, None, None
+        if event is not None:
+            try:
+                await event.end()
+            except discord.NotFound:
+                pass
+
+    async def disable(self) -> None:
+        self.disabled = True
+        async with self._lock:
+            await self.end()
+
+    def enable(self) -> None:
+        self.disabled = False
+        self.set_count(self.count)
 
 
 class ThreadsHelpTickets(commands.Cog):
@@ -32,9 +170,20 @@ class ThreadsHelpTickets(commands.Cog):
         self.bot: HelpCenterBot = bot
         self._requests_channel_wb: discord.Webhook | None
 
-        self.current_requests: list[Request] = []
+        # The requests listed in #requests, kept across restarts.
+        self.tickets = TicketStore(DATABASE_PATH)
+
+        # Thread events only record what changed ({thread_id: is_open}), and a burst of events is applied at once.
+        self._pending_threads: dict[Snowflake, bool] = {}
+        self._listing_failures: dict[Snowflake, int] = {}  # By thread, for the threads that could not be listed
+        self._reconcile_lock = asyncio.Lock()
+        self.overview_updater = Coalescer(self.reconcile, OVERVIEW_WINDOW, self.bot.logger)
+
+        # The "X started a thread" messages in #requests, by thread ID, to delete them once the thread is set up.
+        self._thread_created_messages: dict[Snowflake, asyncio.Future[discord.Message]] = {}
 
-        self.queue: asyncio.Queue[int] = asyncio.Queue(maxsize=1)
+    async def cog_unload(self) -> None:
+        self.tickets.close()
 
     @commands.Cog.listener()
     async def on_ready(self) -> None:
@@ -45,14 +194,76 @@ class ThreadsHelpTickets(commands.Cog):
         self.create_thread_view = CreateThreadView(self)
         self.bot.add_view(self.create_thread_view, message_id=REQUEST_MESSAGE_ID)
 
-        bug_center: discord.Guild = self.new_request_channel.guild
-        self.event: discord.ScheduledEvent | None = find(
-            lambda event: event.name.startswith("Demandes d'aide : "), bug_center.scheduled_events
+        self.event_counter = EventCounter(
+            self.new_request_channel.guild, f"<#{NEW_REQUEST_CHANNEL_ID}>", self.bot.logger
         )
-        self.event_disabled = False
 
         await self.update_message_overview()
-        await self.update_overview()
+        if len(self.tickets):
+            # Only the threads that changed while the bot was offline need to be updated.
+            open_threads = {thread.id for thread in self.requests_channel.threads}
+            self._pending_threads.update({ticket.thread_id: False for ticket in self.tickets})
+            self._pending_threads.update({thread_id: True for thread_id in open_threads})
+            await self.reconcile()
+        else:
+            await self.full_reconcile()
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message) -> None:
+        if (
+            message.type is not discord.MessageType.thread_created
+            or message.channel.id != REQUESTS_CHANNEL_ID
+            or message.reference is None
+        ):
+            return
+
+        # The reference of a thread_created message points to the thread.
+        if not (future := self.thread_created_message(cast(Snowflake, message.reference.channel_id))).done():
+            future.set_result(message)
+
+    def thread_created_message(self, thread_id: Snowflake) -> asyncio.Future[discord.Message]:
+        """Return a future for the thread_created message of a thread, whether it has already been received or not."""
+        if (future := self._thread_created_messages.get(thread_id)) is None:
+            future = self._thread_created_messages[thread_id] = self.bot.loop.create_future()
+            self.bot.loop.call_later(THREAD_CREATED_TIMEOUT, self._thread_created_messages.pop, thread_id, None)
+        return future
+
+    async def setup_request_thread(self, thread: discord.Thread, user: discord.abc.User, content: str) -> list[str]:
+        """Set up a thread created with the modal, and return the steps that failed."""
+
+        async def delete_thread_created_message() -> None:
+            future = self.thread_created_message(thread.id)
+            message = await asyncio.wait_for(asyncio.shield(future), THREAD_CREATED_TIMEOUT)
+            self._thread_created_messages.pop(thread.id, None)
+            await retry(message.delete, should_retry=is_retryable)
+
+        async def send_content() -> None:
+            view = ui.View()
+            view.stop()
+            view.add_item(ui.Button(label="Archive", custom_id=f"archive_help_thread_{user.id}"))
+
+            # Sending is not retried: a timeout after Discord accepted the message would post it twice.
+            message = await thread.send(content=content, view=view)
+            await retry(message.pin, should_retry=is_retryable)
+
+        # These steps don't depend on each other, so they are run concurrently. Only the idempotent requests are retried.
+        steps: dict[str, Awaitable[None]] = {
+            "message de création": delete_thread_created_message(),
+            "ajout de l'utilisateur": retry(
+                lambda: thread.add_user(cast(discord.Member, user)), should_retry=is_retryable
+            ),
+            "envoi du message": send_content(),
+            "ajout à la liste des demandes": self.open_request(thread, user),
+        }
+        results = await asyncio.gather(*steps.values(), return_exceptions=True)
+        self.overview_updater.trigger()
+
+        failures: list[str] = []
+        for step_name, result in zip(steps, results):
+            if isinstance(result, BaseException):
+                failures.append(step_name)
+                self.bot.logger.error(f"Help thread {thread.id} setup failed ({step_name}).", exc_info=result)
+        return failures
 
     @commands.Cog.listener()
     async def on_interaction(self, inter: discord.Interaction) -> None:  # on_interaction should not be used, but..
@@ -82,28 +293,67 @@ class ThreadsHelpTickets(commands.Cog):
 
     @commands.Cog.listener()
     async def on_raw_thread_update(self, payload: RawThreadUpdateEvent) -> None:
-        print(self.requests_channel.threads)
         if payload.parent_id != REQUESTS_CHANNEL_ID:
             return
-        await self.update_overview()
+
+        # The raw event is dispatched before the cached thread is updated, so the payload is the source of truth.
+        if payload.data.get("thread_metadata", {}).get("archived", False):
+            self._pending_threads[payload.thread_id] = False
+        elif payload.thread is None:  # Archived threads are not cached, so the thread has been unarchived.
+            self._pending_threads[payload.thread_id] = True
+        else:
+            return
+        self.overview_updater.trigger()
+
+    @commands.Cog.listener()
+    async def on_thread_create(self, thread: discord.Thread) -> None:
+        # The threads of the modal are created by the bot, and listed by setup_request_thread.
+        if thread.parent_id != REQUESTS_CHANNEL_ID or thread.owner_id == cast(discord.ClientUser, self.bot.user).id:
+            return
+        self._pending_threads[thread.id] = True
+        self.overview_updater.trigger()
 
     @commands.Cog.listener()
     async def on_raw_thread_delete(self, payload: RawThreadDeleteEvent) -> None:
         if not payload.parent_id == REQUESTS_CHANNEL_ID:
             return
-        await self.update_overview()
+        self._pending_threads[payload.thread_id] = False
+        self.overview_updater.trigger()
 
     @app_commands.command()
     @app_commands.guilds(BUG_CENTER_ID)
     async def toggle_event(self, inter: discord.Interaction) -> None:
-        if self.event_disabled is False:
-            if self.event is not None and self.event.status == discord.EventStatus.active:
-                await self.event.end()
+        if self.event_counter.disabled:
+            self.event_counter.enable()
         else:
-            await self.create_scheduled_event()
-        self.event_disabled = not self.event_disabled
+            await self.event_counter.disable()
         await inter.response.send_message(
-            content=f"Event {'disabled' if self.event_disabled else 'enabled'}", ephemeral=True
+            content=f"Event {'disabled' if self.event_counter.disabled else 'enabled'}", ephemeral=True
+        )
+
+    @commands.Cog.listener()
+    async def on_scheduled_event_delete(self, event: discord.ScheduledEvent) -> None:
+        self.event_counter.forget(event.id)
+
+    @commands.Cog.listener()
+    async def on_scheduled_event_update(self, before: discord.ScheduledEvent, after: discord.ScheduledEvent) -> None:
+        if after.status in (discord.EventStatus.ended, discord.EventStatus.cancelled):
+            self.event_counter.forget(after.id)
+
+    @app_commands.command()
+    @app_commands.guilds(BUG_CENTER_ID)
+    @app_commands.default_permissions(manage_threads=True)
+    async def resync_requests(self, inter: discord.Interaction) -> None:
+        """Rebuild the list of requests from the threads and the messages of #requests."""
+        await inter.response.defer(ephemeral=True)
+        await self.full_reconcile()
+        await inter.followup.send(
+            content=(
+                f"{len(self.tickets)} requests listed.\n"
+                f"{self.overview_updater.triggers} thread events received, "
+                f"applied in {self.overview_updater.runs} updates."
+            ),
+            ephemeral=True,
         )
 
     @property
@@ -119,18 +369,6 @@ class ThreadsHelpTickets(commands.Cog):
             return int(result.group(1))
         return None
 
-    async def create_scheduled_event(self) -> discord.ScheduledEvent:
-        bug_center: discord.Guild = self.new_request_channel.guild
-        event = await bug_center.create_scheduled_event(
-            name=f"Demandes d'aide : {len(self.new_request_channel.threads)}",
-            start_time=datetime.now(timezone.utc) + timedelta(minutes=10),
-            entity_type=discord.EntityType.external,
-            location=f"<#{NEW_REQUEST_CHANNEL_ID}>",
-            end_time=datetime.now(timezone.utc) + timedelta(days=365 * 3),
-        )
-        self.event = await event.start()
-        return self.event
-
     def create_overview_embed(self) -> discord.Embed:
         embed = discord.Embed(
             color=discord.Color.blurple(),
@@ -169,68 +407,97 @@ class ThreadsHelpTickets(commands.Cog):
             ),
         )
 
-    async def update_overview(self) -> None:
-        # edits are done using the state of discord when executed, so excessive edits are not necessary
-        if self.queue.qsize() > 1:
-            return
-
-        await self.queue.put(0)
-
-        for cached_request in self.current_requests.copy():
-            if get(self.requests_channel.threads, id=cached_request.thread_id) is not None:
-                continue
-            await self.requests_channel.delete_messages((discord.Object(cached_request.request_message_id),))
-            self.current_requests.remove(cached_request)
-
-        async for message in self.requests_channel.history():
-            if (thread_id := self.get_thread_id_from_content(message.content)) is None or get(
-                self.requests_channel.threads, id=thread_id
-            ) is None:
-                await message.delete()
-            elif get(self.current_requests, request_message_id=message.id) is None:
-                self.current_requests.append(Request(request_message_id=message.id, thread_id=thread_id, user_id=None))
-
-        for thread in self.requests_channel.threads:
-            if get(self.current_requests, thread_id=thread.id) is not None:
-                continue
-
+    async def open_request(self, thread: discord.Thread, user: discord.abc.User | None = None) -> None:
+        """List a thread in #requests. If the author is not given, it is taken from the first message of the thread."""
+        if user is None:
             message = [m async for m in thread.history(oldest_first=True, limit=1)][0]
-            user = message.mentions[0] if message.mentions else None
-
-            if message.type is not discord.MessageType.recipient_add or user is None:
-                username: str = "Utilisateur inconnu"
-                avatar_url: str | None = None
-            else:
-                username = user.display_name
-                avatar_url = user.display_avatar.url
-
-            await (await self.requests_channel_webhook).send(
-                content=f"[{thread.name}](https://discord.com/channels/{BUG_CENTER_ID}/{thread.id})",
-                username=username,
-                avatar_url=avatar_url,
-                wait=True,
-            )
-
-        if not self.event_disabled:
-            if len(self.new_request_channel.threads) == 0:
-                if self.event is not None and self.event.status == discord.EventStatus.active:  # Duplicate condition...
-                    await self.event.end()
-                self.event = None
-            elif self.event is not None and self.event.status == discord.EventStatus.active:
-                self.event = await self.event.edit(
-                    name=f"Demandes d'aide : {len(self.new_request_channel.threads)}",
-                    entity_type=discord.EntityType.external,
-                    location=f"<#{NEW_REQUEST_CHANNEL_ID}> (#{self.new_request_channel.name})",
-                    end_time=datetime.now(timezone.utc) + timedelta(days=365 * 3),
-                )
-            else:
-                await self.create_scheduled_event()
-
-        async def release_queue_delayed():
-            await asyncio.sleep(10)
-            await self.queue.get()
-
-        asyncio.create_task(release_queue_delayed())
+            if message.type is discord.MessageType.recipient_add and message.mentions:
+                user = message.mentions[0]
+
+        message = await (await self.requests_channel_webhook).send(
+            content=f"[{thread.name}](https://discord.com/channels/{BUG_CENTER_ID}/{thread.id})",
+            username=user.display_name if user else "Utilisateur inconnu",
+            avatar_url=user.display_avatar.url if user else None,
+            wait=True,
+        )
+        self.tickets.open_ticket(message.id, thread.id, user.id if user else None)
+
+    async def reconcile(self) -> None:
+        """Apply the changes recorded by the thread events since the last reconcile."""
+        async with self._reconcile_lock:
+            pending_threads, self._pending_threads = self._pending_threads, {}
+            to_delete: list[Snowflake] = []
+            failed = False
+            for thread_id, is_open in pending_threads.items():
+                failures = self._listing_failures.pop(thread_id, 0)
+                if not is_open:
+                    if (ticket := self.tickets.close_ticket(thread_id)) is not None:
+                        to_delete.append(ticket.request_message_id)
+                    continue
+                if thread_id in self.tickets.by_thread:
+                    continue
+
+                try:
+                    thread = self.requests_channel.get_thread(thread_id) or await self.bot.fetch_channel(thread_id)
+                    await self.open_request(cast(discord.Thread, thread))
+                except (discord.NotFound, discord.Forbidden):
+                    pass  # The thread has been deleted since
+                except Exception as e:
+                    if failures + 1 >= LISTING_ATTEMPTS:
+                        self.bot.logger.error(
+                            f"Help thread {thread_id} cannot be listed, use /resync_requests. Error : {e}"
+                        )
+                        continue
+                    # Kept for the next reconcile, unless a newer event replaced it.
+                    if self._pending_threads.setdefault(thread_id, is_open) == is_open:
+                        self._listing_failures[thread_id] = failures + 1
+                    failed = True
+                    self.bot.logger.warning(f"Help thread {thread_id} cannot be listed, retrying later. Error : {e}")
+
+            try:
+                await delete_messages(self.requests_channel, to_delete, self.bot.logger)
+            finally:
+                self.event_counter.set_count(len(self.tickets))
+                if failed:
+                    self.overview_updater.trigger()
+
+    async def full_reconcile(self) -> None:
+        """
+        Rebuild the list of requests from the current state of #requests, with the history of the channel.
+        Events only apply their changes, so this is only needed at startup or if something went wrong.
+        """
+        async with self._reconcile_lock:
+            self._pending_threads.clear()  # The current state of the channel is used anyway
+            self._listing_failures.clear()
+            open_threads: dict[Snowflake, discord.Thread] = {
+                thread.id: thread for thread in self.requests_channel.threads
+            }
+
+            to_delete: set[Snowflake] = set()  # The messages of the closed tickets are also found in the history
+            for ticket in self.tickets:
+                if ticket.thread_id not in open_threads:
+                    self.tickets.close_ticket(ticket.thread_id)
+                    to_delete.add(ticket.request_message_id)
+
+            async for message in self.requests_channel.history():
+                if message.id in self.tickets.by_message:
+                    continue
+                if (
+                    (thread_id := self.get_thread_id_from_content(message.content)) is None
+                    or thread_id not in open_threads
+                    or thread_id in self.tickets.by_thread  # A duplicate
+                ):
+                    to_delete.add(message.id)
+                else:
+                    self.tickets.open_ticket(request_message_id=message.id, thread_id=thread_id, user_id=None)
+
+            await delete_messages(self.requests_channel, to_delete, self.bot.logger)
+
+            for thread in open_threads.values():
+                if thread.id not in self.tickets.by_thread:
+                    await self.open_request(thread)
+
+            self.event_counter.set_count(len(self.tickets))
 
 
 class CreateThreadView(ui.View):
@@ -241,8 +508,8 @@ class CreateThreadView(ui.View):
 
     @ui.button(label="Nouveau", custom_id="create_help_channel", emoji="➕", style=discord.ButtonStyle.blurple)
     async def create_help_channel(self, inter: discord.Interaction, button: ui.Button[Self]) -> None:
-        if len(list(filter(lambda r: r.user_id == inter.user.id, self.cog.current_requests))) >= 5:
-            await inter.response.send_message(
+        if self.cog.tickets.count_user(inter.user.id) >= 5:
+            return await inter.response.send_message(
                 ":x: Vous avez déjà atteins le nombre maximal de demandes. Archivez vos demandes précédentes.",
                 ephemeral=True,
             )
@@ -268,43 +535,18 @@ class CreateThreadModal(ui.Modal, title=""):
         self.cog: ThreadsHelpTickets = cog
 
     async def on_submit(self, interaction: discord.Interaction) -> None:
-        task = asyncio.create_task(
-            self.cog.bot.wait_for(
-                "message",
-                check=lambda message: message.channel.id == REQUESTS_CHANNEL_ID
-                and message.type == discord.MessageType.thread_created,
-            )
-        )
-
         thread = await self.cog.requests_channel.create_thread(
             name=f"{self.thread_title.value}",
             type=discord.ChannelType.public_thread,
             reason="HelpCenter help-thread system.",
         )
+        await interaction.response.send_message(ephemeral=True, content=f"Un salon a été créé : <#{thread.id}>")
 
-        async def additionnel_requests():
-            await (await task).delete()
-
-            view = ui.View()
-            view.stop()
-            view.add_item(ui.Button(label="Archive", custom_id=f"archive_help_thread_{interaction.user.id}"))
-
-            await thread.add_user(interaction.user)
-            message: discord.Message = await thread.send(content=self.thread_content.value, view=view)
-            await message.pin()
-
-            message = await (await self.cog.requests_channel_webhook).send(
-                content=f"[{thread.name}](https://discord.com/channels/{BUG_CENTER_ID}/{thread.id})",
-                username=interaction.user.display_name,
-                avatar_url=interaction.user.display_avatar.url,
-                wait=True,
+        if failures := await self.cog.setup_request_thread(thread, interaction.user, self.thread_content.value):
+            await interaction.followup.send(
+                ephemeral=True,
+                content=f":warning: Certaines étapes de la création du salon ont échoué : {', '.join(failures)}.",
             )
-            self.cog.current_requests.append(Request(message.id, thread.id, interaction.user.id))
-
-            await self.cog.update_overview()
-
-        asyncio.create_task(additionnel_requests())
-        await interaction.response.send_message(ephemeral=True, content=f"Un salon a été créé : <#{thread.id}>")
 
 
 async def setup(bot: HelpCenterBot) -> None:
@@ -8,7 +8,9 @@ from discord.ext import commands
 
 from utils.constants import BUG_CENTER_ID
 from utils.custom_command_tree import CustomCommandTree
+from utils.http import HTTPService
 from utils.logger import INFO, create_logger
+from utils.scheduler import Scheduler
 
 if typing.TYPE_CHECKING:
     from logging import Logger
@@ -16,6 +18,9 @@ if typing.TYPE_CHECKING:
 
 LOG_LEVEL = int(tmp) if (tmp := os.getenv("LOG_LEVEL")) and tmp.isdigit() else INFO
 logger = create_logger(__name__, level=LOG_LEVEL)
+# Maximum number of concurrent connections to a single host.
+HTTP_LIMIT_PER_HOST = int(tmp) if (tmp := os.getenv("HTTP_LIMIT_PER_HOST")) and tmp.isdigit() else 16
+JOBS_PATH = os.getenv("SCHEDULED_JOBS_PATH", "data/jobs.json")
 
 
 class HelpCenterBot(commands.Bot):
@@ -32,6 +37,11 @@ class HelpCenterBot(commands.Bot):
             intents=discord.Intents.all(),
         )
 
+        # Every HTTP request of the cogs goes through it, so connections are reused.
+        self.http_service = HTTPService(limit_per_host=HTTP_LIMIT_PER_HOST, logger=logger)
+        # Delayed jobs (cleanups, expirations...), kept across restarts. Cogs register their handlers when loaded.
+        self.scheduler = Scheduler(JOBS_PATH, logger=logger)
+
         self.initial_extensions: list[str] = [
             "cogs.lines",
             "cogs.googleit",
@@ -47,6 +57,12 @@ class HelpCenterBot(commands.Bot):
                 await self.load_extension(ext)
             except Exception as e:
                 logger.error(f"Failed to load extension {ext}.", exc_info=e)
+        self.scheduler.start()
+
+    async def close(self) -> None:
+        await self.scheduler.stop()
+        await super().close()
+        await self.http_service.close()
 
     async def on_ready(self) -> None:
         bot_user = typing.cast(discord.ClientUser, self.user)  # Bot is logged in, so it's a ClientUser
@@ -1,21 +1,27 @@
-import json
-from typing import Any
+from __future__ import annotations
 
-import aiohttp
+from typing import TYPE_CHECKING, Any
 
+if TYPE_CHECKING:
+    from ..http import HTTPService
 
-async def create_new_gist(token: str, file_name: str, file_content: str) -> dict[str, Any]:
+
+async def create_new_gist(http: HTTPService, token: str, file_name: str, file_content: str) -> dict[str, Any]:
+    return await create_gist(http, token, {file_name: file_content})
+
+
+async def create_gist(http: HTTPService, token: str, files: dict[str, str]) -> dict[str, Any]:
     url = "https://api.github.com/gists"
     header = {"Authorization": f"token {token}"}
-    payload = {"files": {file_name: {"content": file_content}}, "public": True}
-    async with aiohttp.ClientSession(headers=header) as session:
-        async with session.post(url=url, json=payload) as response:
-            return json.loads(await response.text())
+    payload = {"files": {file_name: {"content": content} for file_name, content in files.items()}, "public": True}
+    response = await http.fetch("POST", url, json=payload, headers=header, endpoint="gist create")
+    return response.json()
 
 
-async def delete_gist(token: str, gist_id: str) -> bool:
+async def delete_gist(http: HTTPService, token: str, gist_id: str) -> bool:
     url = "https://api.github.com/gists/" + gist_id
     header = {"Authorization": f"token {token}"}
-    async with aiohttp.ClientSession(headers=header) as session:
-        async with session.delete(url=url):
-            return True
+    response = await http.fetch("DELETE", url, headers=header, endpoint="gist delete")
+    if response.status != 404:  # Already deleted
+        response.raise_for_status()
+    return True
@@ -1,12 +1,21 @@
-from typing import Optional
+from __future__ import annotations
 
-import aiohttp
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from ..http import HTTPService
 
 # TODO : fix annotations
 
 
 async def execute_piston_code(
-    language: str, version: str, files: list, *, stdin: Optional[list] = None, args: Optional[list] = None
+    http: HTTPService,
+    language: str,
+    version: str,
+    files: list,
+    *,
+    stdin: Optional[list] = None,
+    args: Optional[list] = None,
 ) -> dict:
     url = "https://emkc.org/api/v2/piston/execute"
     payload = {"language": language, "version": version, "files": files}
@@ -15,9 +24,8 @@ async def execute_piston_code(
     if args:
         payload["args"] = args
 
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url=url, json=payload) as response:
-            json_response: dict = await response.json()
-            if response.status == 200:
-                return json_response["run"]
-            raise Exception(json_response.get("message", "unknown error"))
+    response = await http.fetch("POST", url, json=payload, endpoint="piston execute")
+    json_response: dict = response.json()
+    if response.status == 200:
+        return json_response["run"]
+    raise Exception(json_response.get("message", "unknown error"))
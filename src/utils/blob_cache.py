@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import mmap
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+
+class BlobReader(io.BufferedIOBase):
+    def __init__(self, view: memoryview) -> None:
+        """A read-only file over shared bytes. Every reader has its own position, and nothing is copied upfront."""
+        super().__init__()
+        self._view: memoryview = view
+        self._position: int = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        start = {os.SEEK_SET: 0, os.SEEK_CUR: self._position, os.SEEK_END: len(self._view)}[whence]
+        self._position = max(0, start + offset)
+        return self._position
+
+    def read(self, size: int | None = -1) -> bytes:
+        end = len(self._view) if size is None or size < 0 else min(len(self._view), self._position + size)
+        data = self._view[self._position : end].tobytes()
+        self._position = max(self._position, end)
+        return data
+
+    read1 = read
+
+    def readinto(self, buffer: bytearray | memoryview) -> int:  # type: ignore[override]
+        data = self._view[self._position : self._position + len(buffer)]
+        buffer[: len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+
+class BlobCache:
+    def __init__(self, max_size: int, directory: str | os.PathLike[str] | None = None, use_mmap: bool = False) -> None:
+        """
+        Content-addressed blobs, deduplicated by their sha256 digest.
+        At most max_size bytes are kept in memory, the least recently used blobs are evicted first.
+        Evicted blobs can be brought back from the directory (where blobs are stored as `<digest>` files), either
+        read into memory or memory-mapped.
+        """
+        self.max_size: int = max_size
+        self.directory: Path | None = Path(directory) if directory is not None else None
+        self.use_mmap: bool = use_mmap and self.directory is not None
+
+        self._blobs: OrderedDict[str, memoryview] = OrderedDict()
+        self.size: int = 0
+
+    def __contains__(self, digest: str) -> bool:
+        return digest in self._blobs or (self.directory is not None and (self.directory / digest).is_file())
+
+    def _store(self, digest: str, view: memoryview) -> None:
+        self._blobs[digest] = view
+        self.size += len(view)
+        while self.size > self.max_size and len(self._blobs) > 1:
+            _, evicted = self._blobs.popitem(last=False)
+            self.size -= len(evicted)
+
+    def put(self, data: bytes) -> str:
+        """Add the data to the cache, and return its digest."""
+        digest = hashlib.sha256(data).hexdigest()
+        if digest in self._blobs:
+            self._blobs.move_to_end(digest)
+        else:
+            self._store(digest, memoryview(data))
+        return digest
+
+    def get(self, digest: str) -> memoryview | None:
+        """Return a read-only view over the blob, or None if it is nowhere to be found."""
+        if (view := self._blobs.get(digest)) is not None:
+            self._blobs.move_to_end(digest)
+            return view
+
+        if self.directory is None or not (path := self.directory / digest).is_file():
+            return None
+
+        if self.use_mmap and path.stat().st_size:  # Empty files can't be mapped
+            with open(path, "rb") as f:
+                view = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        else:
+            view = memoryview(path.read_bytes())
+        self._store(digest, view)
+        return view
+
+    def open(self, digest: str) -> BlobReader | None:
+        """Return a new reader over the blob, or None if it is nowhere to be found."""
+        if (view := self.get(digest)) is None:
+            return None
+        return BlobReader(view)
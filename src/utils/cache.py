@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    def __init__(self, max_size: int, ttl: float, clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        A mapping whose entries expire ttl seconds after they are set.
+        At most max_size entries are kept, the least recently used ones are evicted first.
+        """
+        self.max_size: int = max_size
+        self.ttl: float = ttl
+        self.clock: Callable[[], float] = clock
+
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: K) -> bool:
+        """Unlike get, it is not counted in the statistics and doesn't refresh the entry."""
+        return (entry := self._entries.get(key)) is not None and entry[0] > self.clock()
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        if (entry := self._entries.get(key)) is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at <= self.clock():
+            del self._entries[key]
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        self._entries[key] = (self.clock() + (self.ttl if ttl is None else ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: K, default: V | None = None) -> V | None:
+        if (entry := self._entries.pop(key, None)) is None or entry[0] <= self.clock():
+            return default
+        return entry[1]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class SingleFlight(Generic[K, V]):
+    def __init__(self) -> None:
+        """Share a single call between the concurrent callers asking for the same key."""
+        self._calls: dict[K, asyncio.Task[V]] = {}
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._calls
+
+    async def run(self, key: K, func: Callable[[], Awaitable[V]]) -> V:
+        """
+        Return the result of func, or of the call already in flight for the key.
+        A caller being cancelled (e.g. timed out) doesn't cancel the call for the others.
+        """
+        if (task := self._calls.get(key)) is None:
+            task = self._calls[key] = asyncio.ensure_future(func())
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(task)
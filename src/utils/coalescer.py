@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+
+class Coalescer:
+    def __init__(
+        self, callback: Callable[[], Awaitable[None]], window: float, logger: logging.Logger | None = None
+    ) -> None:
+        """
+        Run the callback once per burst of triggers.
+        The first trigger runs the callback right away (leading edge). Triggers received while it runs, or during the
+        window that follows, are merged into a single run at the end of the window (trailing edge).
+        Two runs never overlap.
+        """
+        self.callback: Callable[[], Awaitable[None]] = callback
+        self.window: float = window
+        self.logger: logging.Logger = logger or logging.getLogger(__name__)
+
+        self.triggers: int = 0  # Number of triggers received
+        self.runs: int = 0  # Number of times the callback has been run
+
+        self._task: asyncio.Task[None] | None = None
+        self._pending: bool = False
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def trigger(self) -> None:
+        self.triggers += 1
+        if self.running:
+            self._pending = True
+        else:
+            self._task = asyncio.create_task(self._run())
+
+    async def wait(self) -> None:
+        """Wait until there is nothing left to run."""
+        while self._task is not None and not self._task.done():
+            await asyncio.shield(self._task)
+
+    async def _run(self) -> None:
+        while True:
+            self._pending = False
+            self.runs += 1
+            try:
+                await self.callback()
+            except Exception as e:
+                self.logger.error(f"{self.callback.__qualname__} failed.", exc_info=e)
+
+            await asyncio.sleep(self.window)
+            if not self._pending:
+                return
@@ -20,7 +20,10 @@ class CustomCommandTree(CommandTree["HelpCenterBot"]):
             name=error_message,
             icon_url="https://cdn.discordapp.com/attachments/584397334608084992/1005925420639735870/discord_error_icon.png",
         )
-        await inter.response.send_message(embed=embed, ephemeral=True)
+        if inter.response.is_done():  # The error happened after a defer, or in a later step of the command
+            await inter.followup.send(embed=embed, ephemeral=True)
+        else:
+            await inter.response.send_message(embed=embed, ephemeral=True)
 
     async def on_error(self, interaction: discord.Interaction, error: AppCommandError) -> None:
         """Function called when a command raise an error."""
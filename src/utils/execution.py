@@ -0,0 +1,320 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import shutil
+import signal
+import sys
+import tempfile
+from typing import TYPE_CHECKING, NamedTuple, Protocol, Sequence, cast
+
+from .api.piston import execute_piston_code
+
+if TYPE_CHECKING:
+    from .http import HTTPService
+
+
+class ExecutionError(Exception):
+    """The code could not be run (unsupported language, unreachable backend...), unlike a code that fails."""
+
+
+class ExecutionResult(NamedTuple):
+    stdout: str
+    stderr: str
+    code: int | None  # Exit code, None if the process was killed by a signal
+    signal: str | None = None
+    timed_out: bool = False
+    truncated: bool = False  # The output was too large, and the process was killed
+
+
+class ExecutionBackend(Protocol):
+    def supports(self, language: str) -> bool:
+        ...
+
+    async def execute(self, language: str, code: str, *, stdin: str = "", args: Sequence[str] = ()) -> ExecutionResult:
+        ...
+
+    async def close(self) -> None:
+        ...
+
+
+class PistonBackend:
+    """Run the code with the public Piston API (https://github.com/engineer-man/piston), for every language."""
+
+    def __init__(self, http: HTTPService, versions: dict[str, str] | None = None) -> None:
+        self.http: HTTPService = http
+        self.versions: dict[str, str] = versions or {}  # The latest version is used for the other languages
+
+    def supports(self, language: str) -> bool:
+        return True
+
+    async def execute(self, language: str, code: str, *, stdin: str = "", args: Sequence[str] = ()) -> ExecutionResult:
+        try:
+            run = await execute_piston_code(
+                self.http,
+                language,
+                self.versions.get(language, "*"),
+                [{"content": code}],
+                stdin=stdin or None,
+                args=list(args) or None,
+            )
+        except Exception as e:
+            raise ExecutionError(f"Piston cannot run the code : {e}") from e
+        return ExecutionResult(run.get("stdout", ""), run.get("stderr", ""), run.get("code"), run.get("signal"))
+
+    async def close(self) -> None:
+        pass
+
+
+# Run by the pre-warmed interpreters: it waits for the job, limits its own resources then runs the code as __main__.
+_BOOTSTRAP = """
+import io, json, math, os, resource, sys
+job = json.loads(sys.stdin.buffer.read())
+os.chdir(job["workdir"])
+os.environ["TMPDIR"] = job["workdir"]
+usage = resource.getrusage(resource.RUSAGE_SELF)
+cpu_time = math.ceil(usage.ru_utime + usage.ru_stime) + job["cpu_time"]
+resource.setrlimit(resource.RLIMIT_CPU, (cpu_time, cpu_time + 1))
+resource.setrlimit(resource.RLIMIT_AS, (job["memory"], job["memory"]))
+resource.setrlimit(resource.RLIMIT_FSIZE, (job["file_size"], job["file_size"]))
+resource.setrlimit(resource.RLIMIT_NPROC, (0, 0))
+sys.stdin = io.StringIO(job["stdin"])
+sys.argv = ["main.py", *job["args"]]
+del io, json, math, os, resource, usage, cpu_time
+exec(compile(job.pop("code"), "main.py", "exec"), {"__name__": "__main__", "__builtins__": __builtins__})
+"""
+
+
+class LocalPythonBackend:
+    def __init__(
+        self,
+        pool_size: int = 2,
+        *,
+        concurrency: int = 4,
+        cpu_time: int = 2,
+        memory: int = 256 * 1024 * 1024,
+        wall_time: float = 5,
+        max_output: int = 64 * 1024,
+        file_size: int = 1024 * 1024,
+        executable: str = sys.executable,
+        user: int | None = None,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        """
+        Run Python code in one-shot subprocesses, started in advance so a run doesn't wait for the interpreter startup.
+        At most `concurrency` codes run at the same time, the others wait.
+        The CPU time (seconds), memory (bytes), wall time (seconds), output and written files sizes (bytes) of each run
+        are limited, and the code cannot start other processes. Each run has its own temporary working directory,
+        removed after it.
+        The code must run as another user than the bot: with the same user, it could read the bot's files and its
+        environment (/proc/<pid>/environ), tokens included. So the bot must run as root, and the code runs as `user`
+        (nobody by default), otherwise the executions are refused. The code can still read the files readable by
+        everyone and use the network, so the bot should run in a container. POSIX only.
+        """
+        self.pool_size: int = pool_size
+        self.cpu_time: int = cpu_time
+        self.memory: int = memory
+        self.wall_time: float = wall_time
+        self.max_output: int = max_output
+        self.file_size: int = file_size
+        self.executable: str = executable
+        self.user: int | None = user if user is not None or os.geteuid() != 0 else 65534  # nobody
+        self.logger: logging.Logger = logger or logging.getLogger(__name__)
+
+        self.runs: int = 0
+        self._semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+        self._idle: asyncio.Queue[asyncio.subprocess.Process] | None = None
+        self._spawns: set[asyncio.Task[None]] = set()
+        self._closed: bool = False
+
+    def supports(self, language: str) -> bool:
+        return language.lower() in ("python", "python3", "py")
+
+    @property
+    def idle(self) -> int:
+        return self._idle.qsize() if self._idle else 0
+
+    async def start(self) -> None:
+        """Fill the pool. Called by the first execution if it wasn't before."""
+        if self._idle is not None:
+            return
+        if self.user is None or self.user == os.geteuid():
+            raise ExecutionError(
+                "The code would run as the bot's user, and could read its tokens. Run the bot as root, with a `user` "
+                "to run the code as."
+            )
+        self._idle = asyncio.Queue()
+        for _ in range(self.pool_size):
+            self._spawn_soon(self._idle)
+
+    def _spawn_soon(self, idle: asyncio.Queue[asyncio.subprocess.Process]) -> None:
+        task = asyncio.create_task(self._spawn(idle))
+        self._spawns.add(task)
+        task.add_done_callback(self._spawns.discard)
+
+    async def _spawn(self, idle: asyncio.Queue[asyncio.subprocess.Process]) -> None:
+        try:
+            process = await self._start_process()
+        except ExecutionError as e:
+            self.logger.error(str(e))
+            return
+        if self._closed:
+            process.kill()
+            await process.wait()
+            return
+        idle.put_nowait(process)
+
+    async def _start_process(self) -> asyncio.subprocess.Process:
+        privileges = {"user": self.user, "group": self.user, "extra_groups": []}
+        try:
+            return await asyncio.create_subprocess_exec(
+                self.executable,
+                "-I",  # Ignore the environment variables and the user site-packages
+                "-c",
+                _BOOTSTRAP,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd="/",  # The working directory of the job is given with it
+                env={},  # The bot's secrets are in its environment
+                **privileges,
+            )
+        except OSError as e:
+            raise ExecutionError(f"Cannot start a Python process for the code executions. Error : {e}") from e
+
+    async def _acquire(self) -> asyncio.subprocess.Process:
+        await self.start()
+        idle = cast("asyncio.Queue[asyncio.subprocess.Process]", self._idle)
+        while not idle.empty():
+            process = idle.get_nowait()
+            if process.returncode is None:
+                return process
+            await process.wait()  # Died while idle (killed by the system...)
+            self._refill()
+        return await self._start_process()  # The pool is drained by a burst of executions
+
+    def _refill(self) -> None:
+        if self._closed or self._idle is None:
+            return
+        if self._idle.qsize() + len(self._spawns) < self.pool_size:
+            self._spawn_soon(self._idle)
+
+    async def execute(self, language: str, code: str, *, stdin: str = "", args: Sequence[str] = ()) -> ExecutionResult:
+        if not self.supports(language):
+            raise ExecutionError(f"The language {language} is not supported locally.")
+        if self._closed:
+            raise ExecutionError("The local execution backend is closed.")
+
+        async with self._semaphore:
+            process = await self._acquire()
+            self.runs += 1
+            # A new directory for each run, so the files written by a run are not seen by the next ones.
+            workdir = tempfile.mkdtemp(prefix="execution-")
+            try:
+                if self.user is not None:
+                    os.chown(workdir, self.user, self.user)
+                return await self._run(process, workdir, code, stdin, args)
+            finally:
+                await asyncio.to_thread(shutil.rmtree, workdir, ignore_errors=True)
+                # Replaces the process taken once the run is over, starting a process would slow the run down.
+                self._refill()
+
+    async def _run(
+        self, process: asyncio.subprocess.Process, workdir: str, code: str, stdin: str, args: Sequence[str]
+    ) -> ExecutionResult:
+        # The streams are pipes, so they are not None
+        stdin_writer = cast(asyncio.StreamWriter, process.stdin)
+        stdout_stream = cast(asyncio.StreamReader, process.stdout)
+        stderr_stream = cast(asyncio.StreamReader, process.stderr)
+        job = {
+            "code": code,
+            "stdin": stdin,
+            "args": list(args),
+            "workdir": workdir,
+            "cpu_time": self.cpu_time,
+            "memory": self.memory,
+            "file_size": self.file_size,
+        }
+        stdout, stderr = bytearray(), bytearray()
+        truncated = timed_out = False
+
+        async def read(stream: asyncio.StreamReader, buffer: bytearray) -> None:
+            nonlocal truncated
+            while chunk := await stream.read(64 * 1024):
+                buffer += chunk
+                if len(buffer) > self.max_output:
+                    truncated = True
+                    process.kill()
+                    return
+
+        try:
+            try:
+                stdin_writer.write(json.dumps(job).encode())
+                await stdin_writer.drain()
+                stdin_writer.close()
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # The process exited before reading the job, its stderr tells why
+            await asyncio.wait_for(
+                asyncio.gather(read(stdout_stream, stdout), read(stderr_stream, stderr), process.wait()),
+                self.wall_time,
+            )
+        except asyncio.TimeoutError:
+            timed_out = True
+        finally:
+            if process.returncode is None:
+                process.kill()
+            returncode = await process.wait()
+
+        signal_name = None
+        if returncode < 0:
+            try:
+                signal_name = signal.Signals(-returncode).name
+            except ValueError:
+                signal_name = str(-returncode)
+        return ExecutionResult(
+            stdout[: self.max_output].decode(errors="replace"),
+            stderr[: self.max_output].decode(errors="replace"),
+            returncode if returncode >= 0 else None,
+            signal_name,
+            timed_out,
+            truncated,
+        )
+
+    async def close(self) -> None:
+        self._closed = True
+        for task in list(self._spawns):
+            task.cancel()
+        await asyncio.gather(*self._spawns, return_exceptions=True)
+        while self._idle is not None and not self._idle.empty():
+            process = self._idle.get_nowait()
+            if process.returncode is None:
+                process.kill()
+            await process.wait()
+
+
+class FallbackBackend:
+    """Use the first backend supporting the language, and the next ones if it cannot run the code."""
+
+    def __init__(self, *backends: ExecutionBackend, logger: logging.Logger | None = None) -> None:
+        self.backends: tuple[ExecutionBackend, ...] = backends
+        self.logger: logging.Logger = logger or logging.getLogger(__name__)
+
+    def supports(self, language: str) -> bool:
+        return any(backend.supports(language) for backend in self.backends)
+
+    async def execute(self, language: str, code: str, *, stdin: str = "", args: Sequence[str] = ()) -> ExecutionResult:
+        error: ExecutionError | None = None
+        for backend in self.backends:
+            if not backend.supports(language):
+                continue
+            try:
+                return await backend.execute(language, code, stdin=stdin, args=args)
+            except ExecutionError as e:
+                self.logger.warning(f"{type(backend).__name__} cannot run the code, trying the next backend. {e}")
+                error = e
+        raise error or ExecutionError(f"No execution backend supports the language {language}.")
+
+    async def close(self) -> None:
+        await asyncio.gather(*(backend.close() for backend in self.backends))
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+
+TMP_SUFFIX = ".tmp"
+
+
+def write_atomically(path: str | os.PathLike[str], data: bytes) -> None:
+    """
+    Write into a temporary file first, so a crash never leaves a truncated file behind.
+    The temporary file has a unique name, so concurrent writes of the same path don't collide.
+    """
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=TMP_SUFFIX)
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def is_temporary(path: str | os.PathLike[str]) -> bool:
+    """Whether the file is a temporary file of write_atomically, which may still be being written."""
+    return Path(path).name.endswith(TMP_SUFFIX)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Callable
+
+# Every backend returns the text of the elements matching a CSS selector, as BeautifulSoup's get_text would.
+Backend = Callable[[str, str], list[str]]
+
+
+def _selectolax_backend() -> Backend:
+    from selectolax.lexbor import LexborHTMLParser
+
+    def select_texts(html: str, selector: str) -> list[str]:
+        return [node.text() for node in LexborHTMLParser(html).css(selector)]
+
+    return select_texts
+
+
+def _lxml_backend() -> Backend:
+    import lxml.html
+    from lxml.cssselect import CSSSelector
+
+    selectors: dict[str, CSSSelector] = {}
+
+    def select_texts(html: str, selector: str) -> list[str]:
+        if (compiled := selectors.get(selector)) is None:
+            compiled = selectors[selector] = CSSSelector(selector)
+        return [element.text_content() for element in compiled(lxml.html.fromstring(html))]
+
+    return select_texts
+
+
+def _bs4_backend() -> Backend:
+    from bs4 import BeautifulSoup
+
+    def select_texts(html: str, selector: str) -> list[str]:
+        return [tag.get_text() for tag in BeautifulSoup(html, "html.parser").select(selector)]
+
+    return select_texts
+
+
+# The C-backed parsers are optional dependencies, the first one available is used.
+BACKENDS: dict[str, Callable[[], Backend]] = {
+    "selectolax": _selectolax_backend,
+    "lxml": _lxml_backend,
+    "bs4": _bs4_backend,
+}
+
+
+def load_backend(name: str | None = None) -> tuple[str, Backend]:
+    """Return the backend with this name, or the fastest one installed."""
+    for backend_name in [name] if name else BACKENDS:
+        try:
+            return backend_name, BACKENDS[backend_name]()
+        except ImportError:
+            continue
+    raise ImportError(f"No HTML parser available (tried {name or ', '.join(BACKENDS)}).")
+
+
+BACKEND_NAME, _backend = load_backend(os.getenv("HTML_PARSER"))
+
+
+def subtree(html: str, start_marker: str | None) -> str:
+    """
+    Cut the document before the tag containing the start marker (e.g. 'id="content"'), so the headers, menus and
+    scripts before it are not parsed. The parsers close the remaining tags by themselves.
+    """
+    if start_marker is None or (marker := html.find(start_marker)) == -1:
+        return html
+    return html[max(html.rfind("<", 0, marker), 0) :]
+
+
+def select_texts(
+    html: str, selector: str, start_marker: str | None = None, backend: Backend | None = None
+) -> list[str]:
+    return (backend or _backend)(subtree(html, start_marker), selector)
+
+
+async def select_texts_async(html: str, selector: str, start_marker: str | None = None) -> list[str]:
+    """Like select_texts, in a worker thread so the event loop is not blocked by the parsing."""
+    return await asyncio.to_thread(select_texts, html, selector, start_marker)
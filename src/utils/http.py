@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections import defaultdict
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from typing import Any, AsyncIterator, NamedTuple
+from urllib.parse import urlsplit
+
+import aiohttp
+from multidict import CIMultiDictProxy
+
+from .retry import retry
+
+IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE"))
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+
+class HTTPStatusError(aiohttp.ClientError):
+    def __init__(self, response: HTTPResponse) -> None:
+        """Raised by HTTPResponse.raise_for_status."""
+        super().__init__(f"{response.status} for {response.url}")
+        self.response: HTTPResponse = response
+
+
+class _RetryableStatus(Exception):
+    def __init__(self, response: HTTPResponse) -> None:
+        self.response: HTTPResponse = response
+
+
+class HTTPResponse(NamedTuple):
+    url: str
+    status: int
+    headers: CIMultiDictProxy[str]
+    body: bytes
+
+    @property
+    def ok(self) -> bool:
+        return self.status < 400
+
+    def text(self, encoding: str = "utf-8") -> str:
+        return self.body.decode(encoding)
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+    def raise_for_status(self) -> None:
+        if not self.ok:
+            raise HTTPStatusError(self)
+
+
+class EndpointStats:
+    def __init__(self) -> None:
+        """Latency and errors of the requests made to an endpoint."""
+        self.requests: int = 0
+        self.errors: int = 0  # Network errors and error statuses
+        self.total_latency: float = 0
+        self.max_latency: float = 0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.requests if self.requests else 0
+
+    def record(self, latency: float, error: bool) -> None:
+        self.requests += 1
+        self.errors += error
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    def __repr__(self) -> str:
+        return (
+            f"<EndpointStats requests={self.requests} errors={self.errors} "
+            f"mean={self.mean_latency * 1000:.0f}ms max={self.max_latency * 1000:.0f}ms>"
+        )
+
+
+class HTTPService:
+    def __init__(
+        self,
+        *,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        timeout: float = 30,
+        connect_timeout: float = 10,
+        dns_ttl: int = 300,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        """
+        The HTTP client shared by the whole bot. Connections are pooled and kept alive per host, DNS lookups are cached,
+        and the number of concurrent connections to a host is limited.
+        The latency and the errors of the requests are recorded by endpoint, see `stats`.
+        """
+        self.limit: int = limit
+        self.limit_per_host: int = limit_per_host
+        self.timeout = aiohttp.ClientTimeout(total=timeout, connect=connect_timeout)
+        self.dns_ttl: int = dns_ttl
+        self.logger: logging.Logger = logger or logging.getLogger(__name__)
+
+        self.stats: defaultdict[str, EndpointStats] = defaultdict(EndpointStats)
+        self._session: aiohttp.ClientSession | None = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The session is created on first use, because it must be created inside the event loop."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_ttl,
+                keepalive_timeout=30,
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+
+    @asynccontextmanager
+    async def request(
+        self, method: str, url: str, *, endpoint: str | None = None, **kwargs: Any
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """
+        Make a request, like aiohttp.ClientSession.request, and record it.
+        Requests are grouped by endpoint in the stats, by default the method and the host of the URL.
+        """
+        stats = self.stats[endpoint or f"{method} {urlsplit(url).netloc}"]
+        start = time.perf_counter()
+        error = True
+        try:
+            async with self.session.request(method, url, **kwargs) as response:
+                error = response.status >= 400
+                yield response
+        finally:
+            stats.record(time.perf_counter() - start, error)
+
+    def get(self, url: str, **kwargs: Any) -> AbstractAsyncContextManager[aiohttp.ClientResponse]:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> AbstractAsyncContextManager[aiohttp.ClientResponse]:
+        return self.request("POST", url, **kwargs)
+
+    def delete(self, url: str, **kwargs: Any) -> AbstractAsyncContextManager[aiohttp.ClientResponse]:
+        return self.request("DELETE", url, **kwargs)
+
+    async def fetch(
+        self, method: str, url: str, *, endpoint: str | None = None, attempts: int | None = None, **kwargs: Any
+    ) -> HTTPResponse:
+        """
+        Make a request and read the whole response.
+        Network errors and transient statuses (429, 5xx) are retried with a jittered backoff, by default only for
+        idempotent methods. The last response is returned if every attempt got a transient status.
+        """
+        if attempts is None:
+            attempts = 3 if method in IDEMPOTENT_METHODS else 1
+
+        async def attempt() -> HTTPResponse:
+            async with self.request(method, url, endpoint=endpoint, **kwargs) as response:
+                result = HTTPResponse(str(response.url), response.status, response.headers, await response.read())
+            if result.status in RETRY_STATUSES:
+                raise _RetryableStatus(result)
+            return result
+
+        def should_retry(error: Exception) -> bool:
+            if retryable := isinstance(error, (_RetryableStatus, aiohttp.ClientConnectionError, asyncio.TimeoutError)):
+                self.logger.debug(f"{method} {url} failed, retrying. Error : {error!r}")
+            return retryable
+
+        try:
+            return await retry(attempt, attempts=attempts, should_retry=should_retry)
+        except _RetryableStatus as e:
+            return e.response
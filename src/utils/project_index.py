@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Iterable
+
+from .files import write_atomically
+from .search import SearchIndex
+
+
+class ProjectIndex:
+    def __init__(self, path: str | os.PathLike[str], logger: logging.Logger | None = None) -> None:
+        """
+        The names of the documentation projects known so far, saved to a JSON file.
+        Names are searched with a SearchIndex (prefix, substring and fuzzy matches), rebuilt only when names are added.
+        """
+        self.path: Path = Path(path)
+        self.logger: logging.Logger = logger or logging.getLogger(__name__)
+        self.names: set[str] = set()
+        self._index: SearchIndex[str] | None = None
+
+        try:
+            self.names.update(json.loads(self.path.read_bytes()))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError) as e:
+            self.logger.warning(f"The documentation projects cannot be loaded. Error : {e}")
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.names
+
+    def add(self, names: Iterable[str]) -> bool:
+        """Add the names to the index, and return whether there was a new one."""
+        size = len(self.names)
+        self.names.update(names)
+        if len(self.names) == size:
+            return False
+        self._index = None
+        return True
+
+    def search(self, query: str, limit: int = 25) -> list[str]:
+        if self._index is None:
+            self._index = SearchIndex(sorted(self.names), name=lambda name: name)
+        return self._index.search(query, limit)
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomically(self.path, json.dumps(sorted(self.names)).encode())
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float = 30) -> float:
+    """Exponential backoff with full jitter, so concurrent retries don't happen at the same time."""
+    return random.uniform(0, min(max_delay, base_delay * 2**attempt))  # nosec B311
+
+
+async def retry(
+    func: Callable[[], Awaitable[T]],
+    *,
+    attempts: int = 3,
+    base_delay: float = 0.5,
+    should_retry: Callable[[Exception], bool] = lambda e: True,
+) -> T:
+    """Call func until it succeeds, at most `attempts` times, waiting longer and longer between the calls."""
+    for attempt in range(attempts):
+        try:
+            return await func()
+        except Exception as e:
+            if attempt == attempts - 1 or not should_retry(e):
+                raise
+            await asyncio.sleep(backoff_delay(attempt, base_delay))
+    raise AssertionError("unreachable")
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import json
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Awaitable, Callable, NamedTuple
+
+from .files import write_atomically
+from .retry import backoff_delay
+
+JobHandler = Callable[[dict[str, Any]], Awaitable[None]]
+
+
+class Job(NamedTuple):
+    due: float  # Unix timestamp, so jobs survive restarts
+    id: str
+    kind: str
+    data: dict[str, Any]
+    attempt: int = 0
+
+
+class Scheduler:
+    def __init__(
+        self, path: str | os.PathLike[str], logger: logging.Logger | None = None, max_attempts: int = 5
+    ) -> None:
+        """
+        Run jobs after a delay, without keeping a sleeping coroutine per job.
+        Jobs are kept in a heap ordered by due time, and saved to a JSON file so the pending ones are resumed after a
+        restart. A job is run by the handler registered for its kind, and retried with a backoff if it fails.
+        A due job without a handler (e.g. its extension failed to load) is kept, and run once a handler is registered.
+        """
+        self.path: Path = Path(path)
+        self.logger: logging.Logger = logger or logging.getLogger(__name__)
+        self.max_attempts: int = max_attempts
+
+        self.handlers: dict[str, JobHandler] = {}
+        self._heap: list[Job] = []
+        self._running: dict[str, Job] = {}  # Jobs popped from the heap but not done yet, saved too
+        self._unhandled: list[Job] = []  # Due jobs waiting for a handler, saved too
+        self._job_tasks: set[asyncio.Task[None]] = set()  # Strong references, the loop only keeps weak ones
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._heap) + len(self._running) + len(self._unhandled)
+
+    def _load(self) -> None:
+        try:
+            raw_jobs = json.loads(self.path.read_bytes())
+            self._heap = [Job(*raw_job) for raw_job in raw_jobs]
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, TypeError) as e:
+            self.logger.warning(f"The scheduled jobs cannot be loaded. Error : {e}")
+            return
+        heapq.heapify(self._heap)
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        jobs = [*self._heap, *self._running.values(), *self._unhandled]
+        write_atomically(self.path, json.dumps(jobs, separators=(",", ":")).encode())
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        self.handlers[kind] = handler
+        if any(job.kind == kind for job in self._unhandled):
+            for job in self._unhandled:
+                if job.kind == kind:
+                    heapq.heappush(self._heap, job)
+            self._unhandled = [job for job in self._unhandled if job.kind != kind]
+            self._wakeup.set()
+
+    def schedule(self, kind: str, delay: float, **data: Any) -> Job:
+        """Run the handler of kind with data in delay seconds. The data must be JSON serializable."""
+        job = Job(time.time() + delay, uuid.uuid4().hex, kind, data)
+        self._push(job)
+        return job
+
+    def _push(self, job: Job) -> None:
+        heapq.heappush(self._heap, job)
+        self._save()
+        if self._heap[0] is job:
+            self._wakeup.set()  # The runner sleeps until the previous first job
+
+    def start(self) -> None:
+        """Start running the jobs, including the ones saved before the last restart. Register the handlers first."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            timeout = self._heap[0].due - time.time() if self._heap else None
+            if timeout is None or timeout > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            job = heapq.heappop(self._heap)
+            if job.kind not in self.handlers:
+                self.logger.warning(f"No handler registered for the scheduled job {job.kind}, it is kept until one is.")
+                self._unhandled.append(job)
+                continue
+            self._running[job.id] = job
+            task = asyncio.create_task(self._run_job(job))
+            self._job_tasks.add(task)
+            task.add_done_callback(self._job_tasks.discard)
+
+    async def _run_job(self, job: Job) -> None:
+        try:
+            await self.handlers[job.kind](job.data)
+        except Exception as e:
+            if job.attempt + 1 < self.max_attempts:
+                delay = backoff_delay(job.attempt + 1, base_delay=5, max_delay=600)
+                self.logger.warning(f"The scheduled job {job.kind} failed, next try in {delay:.0f}s. Error : {e}")
+                del self._running[job.id]
+                self._push(job._replace(due=time.time() + delay, attempt=job.attempt + 1))
+                return
+            self.logger.error(f"The scheduled job {job.kind} failed {self.max_attempts} times.", exc_info=e)
+
+        del self._running[job.id]
+        self._save()
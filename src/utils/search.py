@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import unicodedata
+from bisect import bisect_left
+from collections import Counter
+from typing import Callable, Generic, Iterable, TypeVar
+
+T = TypeVar("T")
+
+FUZZY_THRESHOLD = 0.3  # Minimal trigram similarity for a fuzzy match
+
+
+def normalize(text: str) -> str:
+    """Return a case and accent insensitive version of the text."""
+    return "".join(char for char in unicodedata.normalize("NFKD", text.casefold()) if not unicodedata.combining(char))
+
+
+def trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class SearchIndex(Generic[T]):
+    def __init__(
+        self,
+        items: Iterable[T],
+        name: Callable[[T], str],
+        category: Callable[[T], str] | None = None,
+        description: Callable[[T], str] | None = None,
+    ) -> None:
+        """
+        An index to search items by name, category and description.
+        It is built once, and then every search only looks at the items that can match.
+        Results with the same relevance keep the order of the given items.
+        """
+        self.items: list[T] = list(items)
+        self.names: list[str] = [normalize(name(item)) for item in self.items]
+        self.descriptions: list[str] = [normalize(description(item)) if description else "" for item in self.items]
+
+        self.sorted_names: list[tuple[str, int]] = sorted((name, i) for i, name in enumerate(self.names))
+        self.categories: dict[str, list[int]] = {}
+        if category:
+            for i, item in enumerate(self.items):
+                self.categories.setdefault(normalize(category(item)), []).append(i)
+
+        # Trigrams are used to find substrings, and are padded for fuzzy matching to favor the beginning of words.
+        self.names_trigrams: dict[str, list[int]] = self._build_postings(self.names)
+        self.descriptions_trigrams: dict[str, list[int]] = self._build_postings(self.descriptions)
+        self.fuzzy_trigrams: dict[str, list[int]] = self._build_postings(f"  {name} " for name in self.names)
+        self.fuzzy_sizes: list[int] = [len(trigrams(f"  {name} ")) for name in self.names]
+
+    @staticmethod
+    def _build_postings(texts: Iterable[str]) -> dict[str, list[int]]:
+        postings: dict[str, list[int]] = {}
+        for i, text in enumerate(texts):
+            for trigram in trigrams(text):
+                postings.setdefault(trigram, []).append(i)
+        return postings
+
+    @staticmethod
+    def _candidates(postings: dict[str, list[int]], query: str, texts: list[str]) -> Iterable[int]:
+        """Return the indexes of the texts that contain the query, using the trigrams if the query is long enough."""
+        if len(query) < 3:
+            return (i for i, text in enumerate(texts) if query in text)  # Lazy, the search may stop early
+
+        candidates: set[int] | None = None
+        for trigram in sorted(trigrams(query), key=lambda trigram: len(postings.get(trigram, ()))):
+            posting = postings.get(trigram, ())
+            candidates = set(posting) if candidates is None else candidates.intersection(posting)
+            if not candidates:
+                return []
+        return sorted(i for i in candidates or () if query in texts[i])
+
+    def _prefix_matches(self, query: str) -> list[int]:
+        matches: list[int] = []
+        for name, i in self.sorted_names[bisect_left(self.sorted_names, (query, -1)) :]:
+            if not name.startswith(query):
+                break
+            matches.append(i)
+        return sorted(matches)
+
+    def _fuzzy_matches(self, query: str) -> list[int]:
+        query_trigrams = trigrams(f"  {query} ")
+        shared: Counter[int] = Counter()
+        for trigram in query_trigrams:
+            shared.update(self.fuzzy_trigrams.get(trigram, ()))
+
+        scores = {
+            i: count / (len(query_trigrams) + self.fuzzy_sizes[i] - count) for i, count in shared.items()
+        }  # Jaccard index
+        return sorted((i for i, score in scores.items() if score >= FUZZY_THRESHOLD), key=lambda i: (-scores[i], i))
+
+    def search(self, query: str, limit: int = 25) -> list[T]:
+        """
+        Return the items that match the query, the most relevant first.
+        Items whose name begins with the query are placed first,
+        items whose name contains the query are placed next,
+        then items whose category begins with the query,
+        then items whose description contains the query,
+        and finally items whose name is similar to the query.
+        Descriptions and similarities are ignored for queries shorter than 3 characters, they would match anything.
+        """
+        query = normalize(query.strip())
+        if not query:
+            return self.items[:limit]
+
+        tiers: list[Callable[[], Iterable[int]]] = [
+            lambda: self._prefix_matches(query),
+            lambda: self._candidates(self.names_trigrams, query, self.names),
+            lambda: sorted(i for category, ids in self.categories.items() if category.startswith(query) for i in ids),
+        ]
+        if len(query) >= 3:
+            tiers.append(lambda: self._candidates(self.descriptions_trigrams, query, self.descriptions))
+            tiers.append(lambda: self._fuzzy_matches(query))
+
+        results: dict[int, None] = {}  # Used as an ordered set
+        for tier in tiers:
+            for i in tier():
+                results.setdefault(i)
+                if len(results) >= limit:
+                    return [self.items[i] for i in results]
+        return [self.items[i] for i in results]
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Generic, Iterable, Protocol, TypeVar
+
+if TYPE_CHECKING:
+    from .types import Snowflake
+
+
+class _Role(Protocol):
+    @property
+    def id(self) -> Snowflake:
+        ...
+
+    @property
+    def position(self) -> int:
+        ...
+
+
+R = TypeVar("R", bound=_Role)
+
+
+class SeparatorLayout(Generic[R]):
+    def __init__(self, separators: Iterable[R]) -> None:
+        """
+        The separator roles of a guild, sorted by position so the separators needed by a member are found by bisection.
+        A separator is needed between two roles of a member when it is the lowest separator above the lower role, and
+        is below the upper one.
+        """
+        self.separators: list[R] = sorted(separators, key=lambda role: role.position)
+        self.positions: list[int] = [role.position for role in self.separators]
+        self.ids: frozenset[Snowflake] = frozenset(role.id for role in self.separators)
+
+    def needed(self, roles: Iterable[R]) -> set[R]:
+        """Return the separators needed by a member with these roles (@everyone excluded, separators are ignored)."""
+        positions = sorted(role.position for role in roles if role.id not in self.ids)
+        needed: set[R] = set()
+        for lower, upper in zip(positions, positions[1:]):
+            i = bisect_right(self.positions, lower)
+            if i < len(self.positions) and self.positions[i] < upper:
+                needed.add(self.separators[i])
+        return needed
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Collection
+
+from .files import is_temporary, write_atomically
+
+
+class Snapshot:
+    def __init__(self, directory: str | os.PathLike[str]) -> None:
+        """A JSON index and a content-addressed blob directory, used to keep data across restarts."""
+        self.directory: Path = Path(directory)
+        self.index_path: Path = self.directory / "index.json"
+        self.blobs_directory: Path = self.directory / "blobs"
+
+    def load(self) -> Any | None:
+        """Return the saved index, or None if there is no (valid) snapshot."""
+        try:
+            return json.loads(self.index_path.read_bytes())
+        except (OSError, ValueError):
+            return None
+
+    def save(self, index: Any) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        write_atomically(self.index_path, json.dumps(index, separators=(",", ":")).encode())
+
+    def put_blob(self, data: bytes) -> str:
+        """Store the data if it is not already stored, and return its digest."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.blobs_directory / digest
+        if not path.exists():
+            self.blobs_directory.mkdir(parents=True, exist_ok=True)
+            write_atomically(path, data)
+        return digest
+
+    def get_blob(self, digest: str) -> bytes:
+        return (self.blobs_directory / digest).read_bytes()
+
+    def prune_blobs(self, keep: Collection[str]) -> None:
+        """Remove every blob that is not referenced anymore."""
+        if not self.blobs_directory.is_dir():
+            return
+        for path in self.blobs_directory.iterdir():
+            if path.name not in keep and not is_temporary(path):  # A blob being written by another thread
+                path.unlink(missing_ok=True)
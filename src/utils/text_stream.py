@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import codecs
+from typing import AsyncIterable
+
+# Media types that are never text, so they are rejected before anything is downloaded.
+BINARY_CONTENT_TYPES = ("image/", "video/", "audio/", "font/", "application/zip", "application/gzip", "application/pdf")
+
+
+class NotTextError(ValueError):
+    pass
+
+
+class TooLargeError(ValueError):
+    pass
+
+
+def is_binary_content_type(content_type: str | None) -> bool:
+    return content_type is not None and content_type.startswith(BINARY_CONTENT_TYPES)
+
+
+async def read_text(chunks: AsyncIterable[bytes], max_size: int) -> str:
+    """
+    Decode a stream of UTF-8 chunks, without holding the whole raw file in memory.
+    Stop as soon as the data can't be text (a NUL byte or invalid UTF-8), or is larger than max_size bytes.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    parts: list[str] = []
+    size = 0
+    async for chunk in chunks:
+        size += len(chunk)
+        if size > max_size:
+            raise TooLargeError(size)
+        if b"\0" in chunk:
+            raise NotTextError("NUL byte")
+        try:
+            parts.append(decoder.decode(chunk))
+        except UnicodeDecodeError as e:
+            raise NotTextError(str(e)) from e
+
+    try:
+        parts.append(decoder.decode(b"", final=True))  # A truncated character at the end
+    except UnicodeDecodeError as e:
+        raise NotTextError(str(e)) from e
+    return "".join(parts)
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import time
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, NamedTuple
+
+if TYPE_CHECKING:
+    from .types import Snowflake
+
+
+class Ticket(NamedTuple):
+    request_message_id: Snowflake
+    thread_id: Snowflake
+    user_id: Snowflake | None
+    opened_at: float
+    closed_at: float | None = None
+
+
+class TicketStore:
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """
+        The help requests, saved in a SQLite database so they survive restarts.
+        Open tickets are also kept in memory, indexed by thread, by listing message and by user, so lookups and
+        per-user counts don't hit the database.
+        """
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.connection: sqlite3.Connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL, only the last commits can be lost
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS tickets ("
+                "thread_id INTEGER PRIMARY KEY, "
+                "request_message_id INTEGER NOT NULL, "
+                "user_id INTEGER, "
+                "opened_at REAL NOT NULL, "
+                "closed_at REAL)"
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS tickets_message ON tickets (request_message_id)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS tickets_user ON tickets (user_id, closed_at)")
+
+        self.by_thread: dict[Snowflake, Ticket] = {}
+        self.by_message: dict[Snowflake, Ticket] = {}
+        self.user_counts: Counter[Snowflake] = Counter()
+
+        cursor = self.connection.execute(
+            "SELECT request_message_id, thread_id, user_id, opened_at, closed_at FROM tickets WHERE closed_at IS NULL"
+        )
+        for row in cursor:
+            self._index(Ticket(*row))
+
+    def __len__(self) -> int:
+        return len(self.by_thread)
+
+    def __iter__(self) -> Iterator[Ticket]:
+        """Iterate over the open tickets."""
+        return iter(list(self.by_thread.values()))
+
+    def _index(self, ticket: Ticket) -> None:
+        self.by_thread[ticket.thread_id] = ticket
+        self.by_message[ticket.request_message_id] = ticket
+        if ticket.user_id is not None:
+            self.user_counts[ticket.user_id] += 1
+
+    def count_user(self, user_id: Snowflake) -> int:
+        """Return the number of open tickets of a user."""
+        return self.user_counts[user_id]
+
+    def open_ticket(self, request_message_id: Snowflake, thread_id: Snowflake, user_id: Snowflake | None) -> Ticket:
+        if thread_id in self.by_thread:
+            self.close_ticket(thread_id)
+
+        ticket = Ticket(request_message_id, thread_id, user_id, time.time())
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO tickets VALUES (?, ?, ?, ?, NULL)",
+                (thread_id, request_message_id, user_id, ticket.opened_at),
+            )
+        self._index(ticket)
+        return ticket
+
+    def close_ticket(self, thread_id: Snowflake) -> Ticket | None:
+        """Close the ticket of the thread, and return it if it was open."""
+        if (ticket := self.by_thread.pop(thread_id, None)) is None:
+            return None
+
+        del self.by_message[ticket.request_message_id]
+        if ticket.user_id is not None:
+            self.user_counts[ticket.user_id] -= 1
+            if not self.user_counts[ticket.user_id]:
+                del self.user_counts[ticket.user_id]
+
+        ticket = ticket._replace(closed_at=time.time())
+        with self.connection:
+            self.connection.execute(
+                "UPDATE tickets SET closed_at = ? WHERE thread_id = ?", (ticket.closed_at, thread_id)
+            )
+        return ticket
+
+    def close(self) -> None:
+        self.connection.close()
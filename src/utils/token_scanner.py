@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import re
+import time
+from typing import TYPE_CHECKING, Iterator, NamedTuple
+
+if TYPE_CHECKING:
+    import discord
+
+    from .types import Snowflake
+
+
+# user ID (base64 of the decimal ID) . timestamp . HMAC
+TOKEN_PATTERN = re.compile(r"(?<![\w-])([\w-]{23,28})\.([\w-]{6})\.([\w-]{27,38})(?![\w-])", re.ASCII)
+TOKEN_MIN_LENGTH = 23 + 1 + 6 + 1 + 27
+
+DISCORD_EPOCH = 1420070400  # In seconds
+TOKEN_EPOCH = 1293840000  # Token timestamps are relative to it, or to the Unix epoch for the oldest tokens
+CLOCK_TOLERANCE = 24 * 60 * 60
+
+
+class TokenCandidate(NamedTuple):
+    token: str
+    user_id: Snowflake
+    timestamp_segment: str
+
+
+def decode_user_id(segment: str) -> Snowflake | None:
+    """Decode the first segment of a token, the base64 of the user ID. Return None if it is not one."""
+    try:
+        decoded = base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+    except (binascii.Error, ValueError):
+        return None
+    if not decoded.isdigit() or len(decoded) > 20:
+        return None
+    return int(decoded)
+
+
+def decode_timestamp(segment: str) -> int | None:
+    """Decode the second segment of a token, the time it was generated at. Return None if it is not one."""
+    try:
+        decoded = base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+    except (binascii.Error, ValueError):
+        return None
+    if len(decoded) != 4:
+        return None
+    timestamp = int.from_bytes(decoded, "big")
+    return timestamp if timestamp >= TOKEN_EPOCH else timestamp + TOKEN_EPOCH
+
+
+def is_plausible(candidate: TokenCandidate, now: float | None = None) -> bool:
+    """
+    Check offline that the token could have been issued by Discord: the user ID must be a snowflake of the past, and
+    the token must have been generated after the account creation.
+    """
+    now = time.time() if now is None else now
+    created_at = (candidate.user_id >> 22) / 1000 + DISCORD_EPOCH
+    if not DISCORD_EPOCH < created_at <= now + CLOCK_TOLERANCE:
+        return False
+
+    if (generated_at := decode_timestamp(candidate.timestamp_segment)) is None:
+        return False
+    return created_at - CLOCK_TOLERANCE <= generated_at <= now + CLOCK_TOLERANCE
+
+
+def scan(text: str) -> Iterator[TokenCandidate]:
+    """Find the possible tokens in the text, in a single pass. Tokens whose user ID can't be decoded are skipped."""
+    if len(text) < TOKEN_MIN_LENGTH or text.count(".") < 2:  # Can't hold a token, the most common case
+        return
+
+    seen: set[str] = set()
+    for match in TOKEN_PATTERN.finditer(text):
+        token = match.group(0)
+        if token in seen:
+            continue
+        seen.add(token)
+        if (user_id := decode_user_id(match.group(1))) is not None:
+            yield TokenCandidate(token, user_id, match.group(2))
+
+
+def message_text(message: discord.Message) -> str:
+    """Join the content of a message and the text of its embeds into a single string, to scan it at once."""
+    if not message.embeds:
+        return message.content
+
+    parts: list[str | None] = [message.content]
+    for embed in message.embeds:
+        parts += (embed.title, embed.description, embed.url, embed.author.name, embed.author.url)
+        parts += (embed.footer.text, embed.image.url)
+        for field in embed.fields:
+            parts += (field.name, field.value)
+    return "\n".join(part for part in parts if part)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Generic, Iterable, TypeVar
+
+T = TypeVar("T")
+
+
+class WorkQueue(Generic[T]):
+    def __init__(
+        self, worker: Callable[[T], Awaitable[None]], concurrency: int = 1, logger: logging.Logger | None = None
+    ) -> None:
+        """
+        Process items with a bounded number of workers, and keep track of the progress.
+        A failing item is logged and counted, it doesn't stop the others.
+        """
+        self.worker: Callable[[T], Awaitable[None]] = worker
+        self.concurrency: int = concurrency
+        self.logger: logging.Logger = logger or logging.getLogger(__name__)
+
+        self.total: int = 0
+        self.done: int = 0
+        self.failed: int = 0
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    @property
+    def rate(self) -> float:
+        """Items processed per second."""
+        return (self.done + self.failed) / self.elapsed if self.elapsed else 0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.done + self.failed}/{self.total} ({self.failed} failed) "
+            f"in {self.elapsed:.1f}s, {self.rate:.2f}/s"
+        )
+
+    async def _work(self, queue: asyncio.Queue[T]) -> None:
+        while not queue.empty():
+            item = queue.get_nowait()
+            try:
+                await self.worker(item)
+            except Exception as e:
+                self.failed += 1
+                self.logger.warning(f"{self.worker.__qualname__} failed for {item!r}. Error : {e}")
+            else:
+                self.done += 1
+
+    async def run(self, items: Iterable[T]) -> None:
+        queue: asyncio.Queue[T] = asyncio.Queue()
+        for item in items:
+            queue.put_nowait(item)
+        self.total += queue.qsize()
+
+        self.started_at = self.started_at or time.perf_counter()
+        self.finished_at = None
+        await asyncio.gather(*(self._work(queue) for _ in range(self.concurrency)))
+        self.finished_at = time.perf_counter()
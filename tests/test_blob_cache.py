@@ -0,0 +1,48 @@
+from src.utils.blob_cache import BlobCache
+
+
+def test_blob_cache_deduplication():
+    cache = BlobCache(max_size=1024)
+    digest = cache.put(b"image")
+    assert cache.put(b"image") == digest
+    assert cache.size == len(b"image")
+
+
+def test_blob_cache_readers():
+    cache = BlobCache(max_size=1024)
+    digest = cache.put(b"some image")
+
+    for _ in range(2):  # Every reader starts from the beginning
+        reader = cache.open(digest)
+        assert reader is not None
+        assert reader.read(4) == b"some"
+        assert reader.read() == b" image"
+        assert reader.read() == b""
+        reader.seek(0)
+        assert reader.read() == b"some image"
+
+    assert cache.open("unknown") is None
+
+
+def test_blob_cache_eviction():
+    cache = BlobCache(max_size=10)
+    first = cache.put(b"12345")
+    second = cache.put(b"67890")
+    cache.get(first)  # Now the second is the least recently used
+    cache.put(b"abcde")
+
+    assert cache.get(first) is not None
+    assert cache.get(second) is None
+    assert cache.size == 10
+
+
+def test_blob_cache_directory(tmp_path):
+    for use_mmap in (False, True):
+        cache = BlobCache(max_size=5, directory=tmp_path, use_mmap=use_mmap)
+        digest = cache.put(b"12345")
+        (tmp_path / digest).write_bytes(b"12345")
+        cache.put(b"67890")
+
+        assert digest in cache
+        view = cache.get(digest)
+        assert view is not None and view.tobytes() == b"12345"
@@ -0,0 +1,76 @@
+import asyncio
+
+from src.utils.cache import SingleFlight, TTLCache
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_cache_expiration():
+    clock = Clock()
+    cache: TTLCache[str, int] = TTLCache(max_size=10, ttl=5, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=20)
+
+    assert cache.get("a") == 1
+    clock.now = 5
+    assert cache.get("a") is None
+    assert "a" not in cache
+    assert cache.get("b") == 2
+    clock.now = 20
+    assert cache.get("b", -1) == -1
+    assert len(cache) == 0
+
+
+def test_ttl_cache_eviction():
+    cache: TTLCache[str, int] = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" becomes the least recently used
+    cache.set("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.pop("c") == 3
+    assert cache.pop("c") is None
+
+
+def test_ttl_cache_stats():
+    cache: TTLCache[str, int] = TTLCache(max_size=2, ttl=60)
+    cache.get("a")
+    cache.set("a", 1)
+    cache.get("a")
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert "a" in cache and "b" not in cache  # Not counted
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_single_flight():
+    async def main():
+        calls = 0
+
+        async def fetch() -> int:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        single_flight: SingleFlight[str, int] = SingleFlight()
+        results = await asyncio.gather(*(single_flight.run("a", fetch) for _ in range(5)))
+        assert results == [1] * 5
+        assert "a" not in single_flight
+
+        # A caller timing out doesn't cancel the call.
+        try:
+            await asyncio.wait_for(single_flight.run("b", fetch), 0.001)
+        except asyncio.TimeoutError:
+            pass
+        assert await single_flight.run("b", fetch) == 2
+
+    asyncio.run(main())
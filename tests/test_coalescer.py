@@ -0,0 +1,62 @@
+import asyncio
+
+from src.utils.coalescer import Coalescer
+
+
+def test_coalescer_burst():
+    async def main():
+        calls: list[int] = []
+        running = 0
+
+        async def callback():
+            nonlocal running
+            running += 1
+            assert running == 1  # Runs never overlap
+            calls.append(len(calls))
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        coalescer = Coalescer(callback, window=0.02)
+        for _ in range(10):
+            coalescer.trigger()
+            await asyncio.sleep(0)
+
+        assert calls == [0]  # Leading edge
+        await coalescer.wait()
+        assert calls == [0, 1]  # Trailing edge
+        assert (coalescer.triggers, coalescer.runs) == (10, 2)
+
+    asyncio.run(main())
+
+
+def test_coalescer_single_trigger():
+    async def main():
+        calls = 0
+
+        async def callback():
+            nonlocal calls
+            calls += 1
+
+        coalescer = Coalescer(callback, window=0.01)
+        coalescer.trigger()
+        await coalescer.wait()
+        assert calls == 1
+
+        coalescer.trigger()  # After the window, a new burst begins
+        await coalescer.wait()
+        assert calls == 2
+
+    asyncio.run(main())
+
+
+def test_coalescer_errors():
+    async def main():
+        async def callback():
+            raise ValueError()
+
+        coalescer = Coalescer(callback, window=0)
+        coalescer.trigger()
+        await coalescer.wait()
+        assert coalescer.runs == 1
+
+    asyncio.run(main())
@@ -0,0 +1,118 @@
+import asyncio
+import os
+import stat
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.utils.execution import ExecutionError, ExecutionResult, FallbackBackend, LocalPythonBackend
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="The local backend uses POSIX resource limits")
+
+
+def runnable_by_others(path: str) -> bool:
+    resolved = Path(path).resolve()
+    return all(parent.stat().st_mode & stat.S_IXOTH for parent in (resolved, *resolved.parents))
+
+
+# Under root, the code runs as nobody, who may not be able to run a Python installed in a home directory.
+EXECUTABLE = next(
+    (
+        path
+        for path in (sys.executable, "/usr/local/bin/python3", "/usr/bin/python3")
+        if os.path.exists(path) and (os.geteuid() != 0 or runnable_by_others(path))
+    ),
+    sys.executable,
+)
+
+
+def test_local_python_backend():
+    async def main():
+        backend = LocalPythonBackend(pool_size=2, wall_time=2, cpu_time=1, max_output=1000, executable=EXECUTABLE)
+        try:
+            result = await backend.execute("python", "import sys\nprint(input(), sys.argv[1:])", stdin="hi", args=["a"])
+            assert result == ExecutionResult("hi ['a']\n", "", 0)
+
+            result = await backend.execute("py", "raise ValueError('oops')")
+            assert result.code == 1 and "ValueError: oops" in result.stderr
+
+            results = await asyncio.gather(*(backend.execute("python", f"print({i})") for i in range(5)))
+            assert [result.stdout for result in results] == [f"{i}\n" for i in range(5)]
+            assert backend.runs == 7
+
+            result = await backend.execute("python", "print('x' * 10_000)")
+            assert result.truncated and len(result.stdout) == 1000
+
+            result = await backend.execute("python", "import time\ntime.sleep(10)")
+            assert result.timed_out and result.code is None
+
+            result = await backend.execute("python", "while True: pass")
+            assert result.code is None and result.signal in ("SIGXCPU", "SIGKILL")
+
+            result = await backend.execute("python", "x = bytearray(1024 ** 3)")
+            assert "MemoryError" in result.stderr
+
+            with pytest.raises(ExecutionError):
+                await backend.execute("javascript", "console.log(1)")
+        finally:
+            await backend.close()
+        assert backend.idle == 0
+
+    asyncio.run(main())
+
+
+def test_local_python_backend_isolation():
+    async def main():
+        backend = LocalPythonBackend(pool_size=1, executable=EXECUTABLE)
+        try:
+            result = await backend.execute("python", "open('leak.txt', 'w').write('x')")
+            assert result.code == 0
+            result = await backend.execute("python", "import os\nprint(os.path.exists('leak.txt'), os.listdir())")
+            assert result.stdout == "False []\n"
+
+            fork = "import os\ntry:\n    if os.fork() == 0:\n        os._exit(0)\nexcept OSError:\n    print('blocked')"
+            assert (await backend.execute("python", fork)).stdout == "blocked\n"
+        finally:
+            await backend.close()
+
+    asyncio.run(main())
+
+
+def test_fallback_backend():
+    class FailingBackend:
+        def supports(self, language):
+            return True
+
+        async def execute(self, language, code, *, stdin="", args=()):
+            raise ExecutionError("unreachable")
+
+        async def close(self):
+            pass
+
+    async def main():
+        backend = FallbackBackend(FailingBackend(), LocalPythonBackend(pool_size=1, executable=EXECUTABLE))
+        try:
+            assert (await backend.execute("python", "print(1)")).stdout == "1\n"
+            with pytest.raises(ExecutionError):
+                await backend.execute("javascript", "console.log(1)")
+        finally:
+            await backend.close()
+
+    asyncio.run(main())
+
+
+def test_local_python_backend_refuses_the_bot_user(monkeypatch):
+    monkeypatch.setattr("src.utils.execution.os.geteuid", lambda: 1000)  # The bot doesn't run as root
+
+    async def main():
+        for backend in (
+            LocalPythonBackend(executable=EXECUTABLE),
+            LocalPythonBackend(user=1000, executable=EXECUTABLE),
+        ):
+            with pytest.raises(ExecutionError):
+                await backend.execute("python", "print(open('/proc/1/environ').read())")
+            assert backend.idle == 0 and backend.runs == 0
+            await backend.close()
+
+    asyncio.run(main())
@@ -0,0 +1,43 @@
+import pytest
+
+from src.utils.html_extract import BACKENDS, load_backend, select_texts, subtree
+
+SELECTOR = "#content > div > ul > li > p.title > a"
+PAGE = """
+<html><head><script>var x = "<p class='title'><a>fake</a></p>";</script></head>
+<body>
+<nav><ul><li><p class="title"><a>Menu</a></p></li></ul></nav>
+<div id="content"><div><ul>
+  <li><p class="title"><a href="/a">discord.py (<span>latest</span>)</a></p></li>
+  <li><p class="title"><a href="/b">Disnake &amp; co</a></p><p>Not a title</p></li>
+  <li><p class="other"><a>Ignored</a></p></li>
+</ul></div></div>
+<footer>footer</footer>
+</body></html>
+"""
+EXPECTED = ["discord.py (latest)", "Disnake & co"]
+
+
+def available_backends():
+    for name in BACKENDS:
+        try:
+            yield load_backend(name)
+        except ImportError:
+            continue
+
+
+@pytest.mark.parametrize("name, backend", list(available_backends()))
+def test_backends_are_equivalent(name, backend):
+    assert select_texts(PAGE, SELECTOR, backend=backend) == EXPECTED
+    assert select_texts(PAGE, SELECTOR, start_marker='id="content"', backend=backend) == EXPECTED
+
+
+def test_subtree():
+    assert subtree(PAGE, 'id="content"').startswith('<div id="content">')
+    assert subtree(PAGE, "missing") == PAGE
+    assert subtree(PAGE, None) == PAGE
+
+
+def test_unknown_backend():
+    with pytest.raises(KeyError):
+        load_backend("unknown")
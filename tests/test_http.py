@@ -0,0 +1,66 @@
+import asyncio
+
+from aiohttp import web
+
+from src.utils.http import HTTPService
+
+
+async def start_server(handler) -> tuple[web.AppRunner, str]:
+    app = web.Application()
+    app.router.add_route("*", "/", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, f"http://127.0.0.1:{port}/"
+
+
+def test_fetch_retries_transient_statuses():
+    async def main():
+        calls = 0
+
+        async def handler(request: web.Request) -> web.Response:
+            nonlocal calls
+            calls += 1
+            return web.json_response({"calls": calls}, status=503 if calls < 3 else 200)
+
+        runner, url = await start_server(handler)
+        http = HTTPService()
+        try:
+            response = await http.fetch("GET", url, endpoint="test")
+            assert response.ok
+            assert response.json() == {"calls": 3}
+
+            stats = http.stats["test"]
+            assert (stats.requests, stats.errors) == (3, 2)
+            assert stats.max_latency >= stats.mean_latency > 0
+
+            # Non-idempotent requests are not retried by default.
+            calls = 0
+            response = await http.fetch("POST", url)
+            assert response.status == 503
+            assert calls == 1
+        finally:
+            await http.close()
+            await runner.cleanup()
+
+    asyncio.run(main())
+
+
+def test_request_stats():
+    async def main():
+        async def handler(request: web.Request) -> web.Response:
+            return web.Response(status=404)
+
+        runner, url = await start_server(handler)
+        http = HTTPService()
+        try:
+            async with http.get(url) as response:
+                assert response.status == 404
+            assert http.stats[f"GET {url[7:-1]}"].errors == 1
+        finally:
+            await http.close()
+            await runner.cleanup()
+
+    asyncio.run(main())
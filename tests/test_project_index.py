@@ -0,0 +1,24 @@
+from src.utils.project_index import ProjectIndex
+
+
+def test_project_index(tmp_path):
+    projects = ProjectIndex(tmp_path / "projects.json")
+    assert projects.search("disc") == []
+
+    assert projects.add(["discord.py", "disnake", "requests"])
+    assert not projects.add(["requests"])
+    assert projects.search("dis") == ["discord.py", "disnake"]
+    assert projects.search("dsicord.py") == ["discord.py"]  # Fuzzy
+
+    assert projects.add(["discord-interactions"])  # The search index is rebuilt
+    assert projects.search("discord") == ["discord-interactions", "discord.py"]
+
+    projects.save()
+    reloaded = ProjectIndex(tmp_path / "projects.json")
+    assert len(reloaded) == 4
+    assert "disnake" in reloaded
+
+
+def test_project_index_invalid_file(tmp_path):
+    (tmp_path / "projects.json").write_text("{not json")
+    assert len(ProjectIndex(tmp_path / "projects.json")) == 0
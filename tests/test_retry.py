@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+from src.utils.retry import backoff_delay, retry
+
+
+def test_backoff_delay():
+    for attempt in range(10):
+        assert 0 <= backoff_delay(attempt, base_delay=1, max_delay=8) <= min(8, 2**attempt)
+
+
+def test_retry():
+    calls = 0
+
+    async def flaky():
+        nonlocal calls
+        calls += 1
+        if calls < 3:
+            raise ConnectionError()
+        return "ok"
+
+    assert asyncio.run(retry(flaky, attempts=3, base_delay=0)) == "ok"
+    assert calls == 3
+
+
+def test_retry_gives_up():
+    calls = 0
+
+    async def failing():
+        nonlocal calls
+        calls += 1
+        raise ValueError()
+
+    with pytest.raises(ValueError):
+        asyncio.run(retry(failing, attempts=2, base_delay=0))
+    assert calls == 2
+
+    calls = 0
+    with pytest.raises(ValueError):
+        asyncio.run(retry(failing, attempts=5, base_delay=0, should_retry=lambda e: not isinstance(e, ValueError)))
+    assert calls == 1
@@ -0,0 +1,98 @@
+import asyncio
+import json
+
+from src.utils.scheduler import Scheduler
+
+
+def test_scheduler_runs_jobs_in_order(tmp_path):
+    async def main():
+        done: list[str] = []
+
+        async def handler(data):
+            done.append(data["name"])
+
+        scheduler = Scheduler(tmp_path / "jobs.json")
+        scheduler.register("test", handler)
+        scheduler.start()
+        scheduler.schedule("test", 0.1, name="late")
+        scheduler.schedule("test", 0.02, name="early")  # Wakes the runner up before the first job
+        assert len(scheduler) == 2
+
+        await asyncio.sleep(0.2)
+        await scheduler.stop()
+        assert done == ["early", "late"]
+        assert len(scheduler) == 0
+        assert json.loads((tmp_path / "jobs.json").read_text()) == []
+
+    asyncio.run(main())
+
+
+def test_scheduler_resumes_jobs(tmp_path):
+    async def main():
+        scheduler = Scheduler(tmp_path / "jobs.json")
+        scheduler.schedule("test", 0.05, name="persisted")  # Not started, like a restart before the due time
+
+        done: list[str] = []
+
+        async def handler(data):
+            done.append(data["name"])
+
+        resumed = Scheduler(tmp_path / "jobs.json")
+        assert len(resumed) == 1
+        resumed.register("test", handler)
+        resumed.start()
+        await asyncio.sleep(0.1)
+        await resumed.stop()
+        assert done == ["persisted"]
+
+    asyncio.run(main())
+
+
+def test_scheduler_retries_failed_jobs(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.utils.scheduler.backoff_delay", lambda *args, **kwargs: 0.01)
+
+    async def main():
+        attempts = 0
+
+        async def handler(data):
+            nonlocal attempts
+            attempts += 1
+            raise RuntimeError
+
+        scheduler = Scheduler(tmp_path / "jobs.json", max_attempts=3)
+        scheduler.register("test", handler)
+        scheduler.start()
+        scheduler.schedule("test", 0)
+        await asyncio.sleep(0.1)
+        await scheduler.stop()
+        assert attempts == 3
+        assert len(scheduler) == 0
+
+    asyncio.run(main())
+
+
+def test_scheduler_keeps_unhandled_jobs(tmp_path):
+    async def main():
+        scheduler = Scheduler(tmp_path / "jobs.json")  # The extension registering the handler failed to load
+        scheduler.start()
+        scheduler.schedule("test", 0, name="kept")
+        await asyncio.sleep(0.05)
+        await scheduler.stop()
+        assert len(scheduler) == 1
+
+        done: list[str] = []
+
+        async def handler(data):
+            done.append(data["name"])
+
+        resumed = Scheduler(tmp_path / "jobs.json")
+        assert len(resumed) == 1
+        resumed.start()
+        await asyncio.sleep(0.02)
+        resumed.register("test", handler)  # Registered late, the waiting job is run
+        await asyncio.sleep(0.05)
+        await resumed.stop()
+        assert done == ["kept"]
+        assert len(resumed) == 0
+
+    asyncio.run(main())
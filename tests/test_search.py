@@ -0,0 +1,53 @@
+from src.utils.search import SearchIndex, normalize
+
+
+class Item:
+    def __init__(self, name: str, category: str, description: str = "") -> None:
+        self.name = name
+        self.category = category
+        self.description = description
+
+    def __repr__(self) -> str:
+        return self.name
+
+
+ITEMS = [
+    Item("async", "python", "Les coroutines et asyncio"),
+    Item("classes", "python", "Programmation orientée objet"),
+    Item("pip", "python", "Installer un paquet pour asyncio"),
+    Item("intents", "discord", "Activer les intents privilégiés"),
+    Item("embed", "discord", "Créer un embed"),
+    Item("nodejs", "javascript", "Installer Node.js"),
+]
+INDEX = SearchIndex(ITEMS, name=lambda i: i.name, category=lambda i: i.category, description=lambda i: i.description)
+
+
+def names(query: str) -> list[str]:
+    return [item.name for item in INDEX.search(query)]
+
+
+def test_normalize():
+    assert normalize("Privilégiés") == "privilegies"
+
+
+def test_search_ranking():
+    assert names("in") == ["intents"]
+    assert names("asy") == ["async", "pip"]  # name first, then descriptions
+    assert names("js") == ["nodejs"]
+    assert names("python") == ["async", "classes", "pip"]
+    assert names("") == [item.name for item in ITEMS]
+
+
+def test_search_insensitive():
+    assert names("CLASS") == ["classes"]
+    assert names("orientee") == ["classes"]
+
+
+def test_search_fuzzy():
+    assert names("intnets")[0] == "intents"
+    assert names("zzzz") == []
+
+
+def test_search_limit():
+    assert len(INDEX.search("", limit=2)) == 2
+    assert len(INDEX.search("s", limit=1)) == 1
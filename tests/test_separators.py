@@ -0,0 +1,29 @@
+from typing import NamedTuple
+
+from src.utils.separators import SeparatorLayout
+
+
+class Role(NamedTuple):
+    id: int
+    position: int
+
+
+SEPARATORS = [Role(100, 10), Role(101, 5), Role(102, 20)]
+LAYOUT = SeparatorLayout(SEPARATORS)
+
+
+def test_layout_is_sorted():
+    assert LAYOUT.positions == [5, 10, 20]
+
+
+def test_needed_separators():
+    # A role in each section: every separator below the top role is needed.
+    assert LAYOUT.needed([Role(1, 2), Role(2, 7), Role(3, 15), Role(4, 25)]) == set(SEPARATORS)
+    # Roles in the same section don't need a separator.
+    assert LAYOUT.needed([Role(1, 6), Role(2, 8)]) == set()
+    # Only the lowest separator between two roles is needed.
+    assert LAYOUT.needed([Role(1, 2), Role(2, 25)]) == {Role(101, 5)}
+    # The separators the member already has are ignored.
+    assert LAYOUT.needed([Role(1, 2), Role(101, 5), Role(2, 7)]) == {Role(101, 5)}
+    assert LAYOUT.needed([Role(101, 5)]) == set()
+    assert LAYOUT.needed([]) == set()
@@ -0,0 +1,41 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils.snapshot import Snapshot
+
+
+def test_snapshot_index(tmp_path):
+    snapshot = Snapshot(tmp_path / "snapshot")
+    assert snapshot.load() is None
+
+    snapshot.save({"sha": "abc", "tags": {}})
+    assert snapshot.load() == {"sha": "abc", "tags": {}}
+
+    snapshot.index_path.write_text("{not json")
+    assert snapshot.load() is None
+
+
+def test_snapshot_blobs(tmp_path):
+    snapshot = Snapshot(tmp_path)
+    digest = snapshot.put_blob(b"image")
+    assert snapshot.put_blob(b"image") == digest
+    assert snapshot.get_blob(digest) == b"image"
+
+    other_digest = snapshot.put_blob(b"other image")
+    snapshot.prune_blobs({other_digest})
+    assert [path.name for path in snapshot.blobs_directory.iterdir()] == [other_digest]
+
+
+def test_snapshot_concurrent_blobs(tmp_path):
+    snapshot = Snapshot(tmp_path)
+    with ThreadPoolExecutor(8) as executor:
+        digests = set(executor.map(lambda _: snapshot.put_blob(b"shared image"), range(64)))
+    assert len(digests) == 1
+    assert [path.name for path in snapshot.blobs_directory.iterdir()] == list(digests)
+
+
+def test_prune_blobs_keeps_temporary_files(tmp_path):
+    snapshot = Snapshot(tmp_path)
+    snapshot.put_blob(b"image")
+    (snapshot.blobs_directory / ".abc.x1y2.tmp").write_bytes(b"being written")
+    snapshot.prune_blobs(set())
+    assert [path.name for path in snapshot.blobs_directory.iterdir()] == [".abc.x1y2.tmp"]
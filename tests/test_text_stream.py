@@ -0,0 +1,36 @@
+import asyncio
+
+import pytest
+
+from src.utils.text_stream import NotTextError, TooLargeError, is_binary_content_type, read_text
+
+
+async def stream(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+def test_read_text():
+    encoded = "héllo wörld ✓".encode()
+    # Multi-byte characters are split between chunks.
+    chunks = [encoded[i : i + 3] for i in range(0, len(encoded), 3)]
+    assert asyncio.run(read_text(stream(*chunks), max_size=100)) == "héllo wörld ✓"
+    assert asyncio.run(read_text(stream(), max_size=100)) == ""
+
+
+def test_read_text_rejects():
+    with pytest.raises(TooLargeError):
+        asyncio.run(read_text(stream(b"a" * 10, b"a" * 10), max_size=15))
+    with pytest.raises(NotTextError):
+        asyncio.run(read_text(stream(b"\x89PNG\r\n\x1a\n\0\0"), max_size=100))
+    with pytest.raises(NotTextError):
+        asyncio.run(read_text(stream(b"abc\xff"), max_size=100))
+    with pytest.raises(NotTextError):
+        asyncio.run(read_text(stream("é".encode()[:1]), max_size=100))  # Truncated character
+
+
+def test_is_binary_content_type():
+    assert is_binary_content_type("image/png")
+    assert not is_binary_content_type("text/plain; charset=utf-8")
+    assert not is_binary_content_type("application/octet-stream")  # Unknown extensions, can be text
+    assert not is_binary_content_type(None)
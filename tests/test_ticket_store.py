@@ -0,0 +1,35 @@
+from src.utils.ticket_store import TicketStore
+
+
+def test_ticket_store(tmp_path):
+    store = TicketStore(tmp_path / "data" / "requests.sqlite3")
+    store.open_ticket(request_message_id=10, thread_id=1, user_id=100)
+    store.open_ticket(request_message_id=20, thread_id=2, user_id=100)
+    store.open_ticket(request_message_id=30, thread_id=3, user_id=None)
+
+    assert len(store) == 3
+    assert store.count_user(100) == 2
+    assert store.by_message[20].thread_id == 2
+
+    closed = store.close_ticket(1)
+    assert closed is not None and closed.closed_at is not None
+    assert store.close_ticket(1) is None
+    assert store.count_user(100) == 1
+    assert 10 not in store.by_message
+    store.close()
+
+    store = TicketStore(tmp_path / "data" / "requests.sqlite3")  # Open tickets are loaded back
+    assert sorted(ticket.thread_id for ticket in store) == [2, 3]
+    assert store.count_user(100) == 1
+    assert store.by_thread[2].user_id == 100
+    store.close()
+
+
+def test_ticket_store_reopen():
+    store = TicketStore(":memory:")
+    store.open_ticket(request_message_id=10, thread_id=1, user_id=100)
+    store.open_ticket(request_message_id=11, thread_id=1, user_id=100)
+
+    assert len(store) == 1
+    assert store.count_user(100) == 1
+    assert list(store.by_message) == [11]
@@ -0,0 +1,45 @@
+import base64
+
+from src.utils.token_scanner import TOKEN_EPOCH, TokenCandidate, decode_timestamp, decode_user_id, is_plausible, scan
+
+USER_ID = 595218682670481418  # Created in 2019
+USER_SEGMENT = base64.urlsafe_b64encode(str(USER_ID).encode()).decode().rstrip("=")
+GENERATED_AT = 1_650_000_000  # 2022
+TIMESTAMP_SEGMENT = base64.urlsafe_b64encode((GENERATED_AT - TOKEN_EPOCH).to_bytes(4, "big")).decode().rstrip("=")
+TOKEN = f"{USER_SEGMENT}.{TIMESTAMP_SEGMENT}.{'a1B2c3D4e5' * 3}x-_Z"
+CANDIDATE = TokenCandidate(TOKEN, USER_ID, TIMESTAMP_SEGMENT)
+
+
+def test_decode_user_id():
+    assert decode_user_id(USER_SEGMENT) == USER_ID
+    assert decode_user_id("not-an-id-at-all-definitely") is None
+    assert decode_user_id("!!!") is None
+
+
+def test_scan():
+    assert list(scan(f"here is my token: {TOKEN} oops")) == [CANDIDATE]
+    assert list(scan(f"{TOKEN}\n{TOKEN}")) == [CANDIDATE]  # Duplicates are reported once
+
+
+def test_scan_rejects():
+    assert list(scan("")) == []
+    assert list(scan("a short message.")) == []
+    assert list(scan("no dots " * 20)) == []
+    fake = f"{'A' * 24}.GhYtRw.{'a' * 27}"  # The first segment is not a base64 user ID
+    assert list(scan(fake)) == []
+
+
+def test_is_plausible():
+    now = 1_700_000_000
+    assert decode_timestamp(TIMESTAMP_SEGMENT) == GENERATED_AT
+    assert is_plausible(CANDIDATE, now=now)
+
+    old_segment = base64.urlsafe_b64encode(GENERATED_AT.to_bytes(4, "big")).decode().rstrip("=")
+    assert is_plausible(CANDIDATE._replace(timestamp_segment=old_segment), now=now)  # Relative to the Unix epoch
+
+    assert not is_plausible(CANDIDATE, now=GENERATED_AT - 10 * 24 * 3600)  # Generated in the future
+    assert not is_plausible(CANDIDATE._replace(user_id=12345), now=now)  # Not a snowflake
+    assert not is_plausible(CANDIDATE._replace(user_id=USER_ID << 4), now=now)  # Created in the future
+
+    before_creation = base64.urlsafe_b64encode((1_500_000_000 - TOKEN_EPOCH).to_bytes(4, "big")).decode().rstrip("=")
+    assert not is_plausible(CANDIDATE._replace(timestamp_segment=before_creation), now=now)
@@ -0,0 +1,31 @@
+import asyncio
+
+from src.utils.work_queue import WorkQueue
+
+
+def test_work_queue():
+    async def main():
+        running = 0
+        max_running = 0
+        processed: list[int] = []
+
+        async def worker(item: int) -> None:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.001)
+            running -= 1
+            if item % 5 == 0:
+                raise ValueError(item)
+            processed.append(item)
+
+        queue = WorkQueue(worker, concurrency=3)
+        await queue.run(range(1, 21))
+
+        assert max_running == 3
+        assert sorted(processed) == [i for i in range(1, 21) if i % 5]
+        assert (queue.total, queue.done, queue.failed) == (20, 16, 4)
+        assert queue.rate > 0
+        assert str(queue).startswith("20/20 (4 failed)")
+
+    asyncio.run(main())